@@ -2,6 +2,14 @@ import pygame
 from dataclasses import dataclass
 from abc import ABC, abstractmethod
 import math
+import os
+import sys
+
+# structural_patterns/ on the path for the helpers shared by all demos (common/)
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from common.fixed_step import FixedStepLoop, add_loop_args, lerp
+from common.frame_profiler import frame_profiler
+from common.text_cache import render_text
 
 # =========================
 # Config
@@ -9,6 +17,7 @@ import math
 WIDTH, HEIGHT = 960, 540
 GROUND_Y = HEIGHT - 90
 FPS = 60
+STEP_HZ = 120         # fixed physics rate (independent of FPS)
 
 BG = (20, 24, 28)
 GROUND = (46, 52, 60)
@@ -57,6 +66,7 @@ class Character:
         self.h = 64
         self.x = float(x)
         self.y = float(y)
+        self.prev_x, self.prev_y = self.x, self.y  # state before the last step (interpolation)
         self.vx = 0.0
         self.vy = 0.0
         self.facing = 1         # 1 right, -1 left
@@ -70,7 +80,13 @@ class Character:
     def rect(self) -> pygame.Rect:
         return pygame.Rect(int(self.x), int(self.y), self.w, self.h)
 
+    def render_rect(self, alpha: float = 1.0) -> pygame.Rect:
+        # blend the last two fixed steps so motion stays smooth at any render rate
+        return pygame.Rect(int(lerp(self.prev_x, self.x, alpha)), int(lerp(self.prev_y, self.y, alpha)), self.w, self.h)
+
     def apply(self, cmd: Command, dt: float):
+        self.prev_x, self.prev_y = self.x, self.y
+
         # Horizontal movement (arcade: set velocity from command)
         self.vx = SPEED * cmd.move
         if cmd.move != 0:
@@ -110,8 +126,8 @@ class Character:
         # relax squash
         self.squash *= (1.0 - min(1.0, 6.0 * dt))
 
-    def draw(self, surf: pygame.Surface):
-        r = self.rect()
+    def draw(self, surf: pygame.Surface, alpha: float = 1.0):
+        r = self.render_rect(alpha)
         # squash-stretch around center
         sx = 1.0 + self.squash * 0.6
         sy = 1.0 - self.squash * 0.6
@@ -207,7 +223,6 @@ def draw_ground(surf):
     pygame.draw.line(surf, (70, 76, 84), (0, GROUND_Y), (WIDTH, GROUND_Y), 2)
 
 def draw_hint(surf, adapter_name):
-    font = pygame.font.SysFont("consolas", 18)
     lines = [
         "Adapter Pattern demo — same Character, different input adapters",
         f"Active: {adapter_name}",
@@ -219,26 +234,30 @@ def draw_hint(surf, adapter_name):
     y = 10
     for i, t in enumerate(lines):
         c = WHITE if i < 2 else (200, 200, 200)
-        surf.blit(font.render(t, True, c), (12, y))
+        surf.blit(render_text(t, c), (12, y))
         y += 20
 
 # =========================
 # Main
 # =========================
-def main():
+def main(headless_steps: int = None, steps_per_frame: int = 1):
     pygame.init()
     screen = pygame.display.set_mode((WIDTH, HEIGHT))
     pygame.display.set_caption("Adapter Pattern with pygame — Keyboard / Mouse controls")
-    clock = pygame.time.Clock()
+    loop = FixedStepLoop(STEP_HZ, FPS, headless=headless_steps is not None,
+                         steps_per_frame=steps_per_frame, max_steps=headless_steps)
 
     player = Character(140, GROUND_Y - 64)
 
     adapters = [KeyboardAdapter(), MouseAdapter()]
     active_idx = 0
 
+    prof = frame_profiler("adapter")  # opt-in: FRAME_PROFILE=1
+    jump = dash = False  # edge-triggered input, held until a fixed step consumes it
     running = True
     while running:
-        dt = clock.tick(FPS) / 1000.0
+        steps = loop.advance()
+        prof.begin_frame()
 
         for e in pygame.event.get():
             if e.type == pygame.QUIT:
@@ -248,14 +267,20 @@ def main():
             elif e.type == pygame.KEYDOWN and e.key == pygame.K_ESCAPE:
                 running = False
 
+        prof.mark("event")
+
         adapter = adapters[active_idx]
         cmd = adapter.poll(player.rect())
-        player.apply(cmd, dt)
+        jump, dash = jump or cmd.jump_pressed, dash or cmd.dash_pressed
+        for _ in range(steps):
+            player.apply(Command(cmd.move, jump, dash), loop.dt)
+            jump = dash = False
+        prof.mark("update")
 
         # Render
         screen.fill(BG)
         draw_ground(screen)
-        player.draw(screen)
+        player.draw(screen, loop.alpha)
 
         # Crosshair for mouse control (optional)
         mx, my = pygame.mouse.get_pos()
@@ -263,9 +288,21 @@ def main():
         pygame.draw.circle(screen, CYAN, (mx, my), 12, 1)
 
         draw_hint(screen, adapter.name())
+        prof.draw(screen)
+        prof.mark("render")
         pygame.display.flip()
+        prof.mark("flip")
+        if loop.done:
+            running = False
 
+    prof.close()
+    if loop.headless:
+        print(f"[adapter] {loop.report()}")
     pygame.quit()
 
 if __name__ == "__main__":
-    main()
+    import argparse
+    args = add_loop_args(argparse.ArgumentParser(description="Adapter pattern demo")).parse_args()
+    if args.headless:
+        os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    main(args.headless, args.steps_per_frame)
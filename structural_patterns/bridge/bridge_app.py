@@ -1,6 +1,14 @@
 import pygame
 from abc import ABC, abstractmethod
 import math
+import os
+import sys
+
+# structural_patterns/ on the path for the helpers shared by all demos (common/)
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from common.fixed_step import FixedStepLoop, add_loop_args, lerp
+from common.frame_profiler import frame_profiler
+from common.text_cache import render_text
 
 # =========================
 # Config
@@ -8,6 +16,7 @@ import math
 WIDTH, HEIGHT = 960, 540
 GROUND_Y = HEIGHT - 90
 FPS = 60
+STEP_HZ = 120      # fixed physics rate (independent of FPS)
 
 BG = (20, 24, 28)
 GROUND = (46, 52, 60)
@@ -62,6 +71,7 @@ class Actor:
     """Abstraction: game entity that delegates drawing to a RenderAPI."""
     def __init__(self, x, y, w, h, color, render_api: RenderAPI):
         self.x = float(x); self.y = float(y)
+        self.prev_x, self.prev_y = self.x, self.y  # state before the last step (interpolation)
         self.w = w; self.h = h
         self.vx = 0.0; self.vy = 0.0
         self.facing = 1
@@ -73,10 +83,15 @@ class Actor:
     def rect(self) -> pygame.Rect:
         return pygame.Rect(int(self.x), int(self.y), self.w, self.h)
 
+    def render_rect(self, alpha: float = 1.0) -> pygame.Rect:
+        # blend the last two fixed steps so motion stays smooth at any render rate
+        return pygame.Rect(int(lerp(self.prev_x, self.x, alpha)), int(lerp(self.prev_y, self.y, alpha)), self.w, self.h)
+
     def set_renderer(self, render_api: RenderAPI):
         self.render_api = render_api
 
     def physics(self, dt: float):
+        self.prev_x, self.prev_y = self.x, self.y
         # gravity + integrate
         self.vy += GRAVITY * dt
         self.x += self.vx * dt
@@ -98,13 +113,13 @@ class Actor:
         # relax squash
         self.squash *= (1.0 - min(1.0, 8.0 * dt))
 
-    def draw(self, surf: pygame.Surface):
+    def draw(self, surf: pygame.Surface, alpha: float = 1.0):
         # simple squash-stretch
         sx = 1.0 + self.squash * 0.6
         sy = 1.0 - self.squash * 0.6
         w = max(1, int(self.w * sx))
         h = max(1, int(self.h * sy))
-        r = self.rect()
+        r = self.render_rect(alpha)
         rect = pygame.Rect(r.centerx - w//2, r.centery - h//2, w, h)
         self.render_api.draw_actor(surf, rect, self.facing, self.color, self.squash)
 
@@ -153,7 +168,6 @@ def draw_ground(surf):
     pygame.draw.line(surf, (70, 76, 84), (0, GROUND_Y), (WIDTH, GROUND_Y), 2)
 
 def draw_hint(surf, player_api_name, npc_api_name):
-    font = pygame.font.SysFont("consolas", 18)
     lines = [
         "Bridge Pattern demo — Abstraction: Actor (Player/NPC)  | Implementor: RenderAPI",
         f"Player renderer: {player_api_name}   (1 Solid, 2 Outline, 3 Glow)",
@@ -163,16 +177,17 @@ def draw_hint(surf, player_api_name, npc_api_name):
     y = 10
     for i, t in enumerate(lines):
         c = WHITE if i == 0 else (210,210,210)
-        surf.blit(font.render(t, True, c), (12, y)); y += 20
+        surf.blit(render_text(t, c), (12, y)); y += 20
 
 # =========================
 # Main
 # =========================
-def main():
+def main(headless_steps: int = None, steps_per_frame: int = 1):
     pygame.init()
     screen = pygame.display.set_mode((WIDTH, HEIGHT))
     pygame.display.set_caption("Bridge Pattern with pygame — Actor x RenderAPI")
-    clock = pygame.time.Clock()
+    loop = FixedStepLoop(STEP_HZ, FPS, headless=headless_steps is not None,
+                         steps_per_frame=steps_per_frame, max_steps=headless_steps)
 
     # Implementors (Renderers)
     solid = SolidRenderAPI()
@@ -186,9 +201,11 @@ def main():
     npc    = NPC  (640, GROUND_Y - 64, 48, 64, GREEN, renderers[1])
     player_idx, npc_idx = 0, 1
 
+    prof = frame_profiler("bridge")  # opt-in: FRAME_PROFILE=1
     running = True
     while running:
-        dt = clock.tick(FPS) / 1000.0
+        steps = loop.advance()
+        prof.begin_frame()
 
         for e in pygame.event.get():
             if e.type == pygame.QUIT: running = False
@@ -204,19 +221,34 @@ def main():
                 elif e.key == pygame.K_9: npc_idx = 2; npc.set_renderer(renderers[npc_idx])
 
         keys = pygame.key.get_pressed()
-        player.update(dt, keys)
-        npc.update(dt)
+        prof.mark("event")
+        for _ in range(steps):
+            player.update(loop.dt, keys)
+            npc.update(loop.dt)
+        prof.mark("update")
 
         # render
         screen.fill(BG)
         draw_ground(screen)
-        player.draw(screen)
-        npc.draw(screen)
+        player.draw(screen, loop.alpha)
+        npc.draw(screen, loop.alpha)
         draw_hint(screen, names[player_idx], names[npc_idx])
+        prof.draw(screen)
+        prof.mark("render")
 
         pygame.display.flip()
+        prof.mark("flip")
+        if loop.done:
+            running = False
 
+    prof.close()
+    if loop.headless:
+        print(f"[bridge] {loop.report()}")
     pygame.quit()
 
 if __name__ == "__main__":
-    main()
+    import argparse
+    args = add_loop_args(argparse.ArgumentParser(description="Bridge pattern demo")).parse_args()
+    if args.headless:
+        os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    main(args.headless, args.steps_per_frame)
@@ -0,0 +1,9 @@
+"""
+Small helpers shared by the structural-pattern demos.
+
+The demos are run as scripts from their own folder, so each one puts
+structural_patterns/ on sys.path before importing from here:
+
+    sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+    from common.text_cache import render_text
+"""
@@ -0,0 +1,71 @@
+import time
+
+import pygame
+
+# =========================
+# Fixed-timestep loop driver
+# =========================
+class FixedStepLoop:
+    """
+    Accumulator loop that keeps physics independent of render speed:
+      - advance() measures the real frame time and returns how many fixed
+        steps of `dt` to simulate this frame (a slow frame runs several small
+        steps instead of one huge one; the backlog is capped by `max_frame`)
+      - alpha is the leftover fraction of a step; render at
+        lerp(previous_state, current_state, alpha)
+    Headless mode drops the frame cap and real time altogether: every frame
+    simulates exactly `steps_per_frame` steps, so a run is deterministic and
+    its throughput is measured in steps per second.
+    """
+    def __init__(self, step_hz: int = 120, fps: int = 60, max_frame: float = 0.25,
+                 headless: bool = False, steps_per_frame: int = 1, max_steps: int = None):
+        self.dt = 1.0 / step_hz
+        self.fps = fps
+        self.max_frame = max_frame
+        self.headless = headless
+        self.steps_per_frame = max(1, steps_per_frame)
+        self.max_steps = max_steps
+        self.clock = pygame.time.Clock()
+        self.steps = 0
+        self.frames = 0
+        self._acc = 0.0
+        self._t0 = time.perf_counter()
+
+    def advance(self) -> int:
+        self.frames += 1
+        if self.headless:
+            self.clock.tick()  # uncapped
+            n = self.steps_per_frame
+        else:
+            self._acc += min(self.clock.tick(self.fps) / 1000.0, self.max_frame)
+            n = int(self._acc / self.dt)
+            self._acc -= n * self.dt
+        if self.max_steps is not None:
+            n = min(n, self.max_steps - self.steps)
+        self.steps += n
+        return n
+
+    @property
+    def alpha(self) -> float:
+        return 1.0 if self.headless else self._acc / self.dt
+
+    @property
+    def done(self) -> bool:
+        return self.max_steps is not None and self.steps >= self.max_steps
+
+    def report(self) -> str:
+        secs = max(1e-9, time.perf_counter() - self._t0)
+        return (f"{self.steps} steps / {self.frames} frames in {secs:.2f}s: "
+                f"{self.steps / secs:,.0f} steps/s, {self.frames / secs:,.0f} frames/s "
+                f"(simulated {self.steps * self.dt:.1f}s)")
+
+def lerp(a: float, b: float, t: float) -> float:
+    return a + (b - a) * t
+
+def add_loop_args(ap):
+    """--headless/--steps-per-frame flags shared by the fixed-step demos."""
+    ap.add_argument("--headless", type=int, metavar="STEPS",
+                    help="no window, no frame cap: simulate STEPS fixed steps and print throughput")
+    ap.add_argument("--steps-per-frame", type=int, default=1,
+                    help="fixed steps simulated per rendered frame in headless mode")
+    return ap
@@ -0,0 +1,164 @@
+import atexit
+import csv
+import json
+import os
+import time
+from collections import deque
+from typing import Dict, List, Optional, Tuple
+
+import pygame
+
+from common.text_cache import render_text
+
+PHASES = ("event", "update", "render", "flip")
+PHASE_COLORS = ((90, 160, 255), (120, 220, 120), (250, 210, 60), (235, 80, 70))
+
+# =========================
+# Frame profiler (opt-in)
+# =========================
+class FrameProfiler:
+    """
+    Per-phase frame timing for a demo's main loop:
+      - the loop calls begin_frame(), then mark(phase) after each phase
+        (event, update, render, flip); time between marks goes to that phase
+      - the last `capacity` frames are kept in a ring buffer
+      - draw() shows a scrolling stacked-bar graph plus the mean of each phase
+      - close() writes the buffered frames as CSV or JSON (chosen by extension)
+    Time spent in clock.tick() (frame-cap sleep) happens before begin_frame()
+    and is not counted.
+    """
+    GRAPH_W, GRAPH_H = 240, 60
+    GRAPH_MS = 33.3  # full graph height; the guide line marks 16.7 ms (60 FPS)
+
+    def __init__(self, name: str, path: str, capacity: int = 600):
+        self.name = name
+        self.path = path
+        self.frames: deque = deque(maxlen=capacity)  # (event, update, render, flip) in ns
+        self.total_frames = 0
+        self._current: List[int] = [0] * len(PHASES)
+        self._last = 0
+        self._graph: Optional[pygame.Surface] = None
+        self._labels: List[str] = []
+        self._labels_at = 0
+        self._closed = False
+        atexit.register(self.close)  # still dump if the loop exits through sys.exit()
+
+    # ---- instrumentation ----
+    def begin_frame(self):
+        self._current = [0] * len(PHASES)
+        self._last = time.perf_counter_ns()
+
+    def mark(self, phase: str):
+        now = time.perf_counter_ns()
+        self._current[PHASES.index(phase)] += now - self._last
+        self._last = now
+        if phase == PHASES[-1]:
+            self._end_frame()
+
+    def _end_frame(self):
+        sample = tuple(self._current)
+        self.frames.append(sample)
+        self.total_frames += 1
+        self._push_column(sample)
+
+    # ---- overlay ----
+    def _push_column(self, sample: Tuple[int, ...]):
+        # scroll the cached graph one pixel and paint only the new column
+        if self._graph is None:
+            self._graph = pygame.Surface((self.GRAPH_W, self.GRAPH_H), pygame.SRCALPHA)
+            self._graph.fill((0, 0, 0, 150))
+        g = self._graph
+        g.scroll(-1, 0)
+        x = self.GRAPH_W - 1
+        g.fill((0, 0, 0, 150), (x, 0, 1, self.GRAPH_H))
+        y = self.GRAPH_H
+        scale = self.GRAPH_H / (self.GRAPH_MS * 1e6)
+        for ns, color in zip(sample, PHASE_COLORS):
+            h = int(ns * scale + 0.5)
+            if h <= 0:
+                continue
+            y -= h
+            g.fill(color, (x, max(0, y), 1, h))
+            if y <= 0:
+                break
+        guide = self.GRAPH_H - int(16.7e6 * scale)
+        g.fill((255, 255, 255, 120), (x, guide, 1, 1))
+
+    def summary(self) -> Dict[str, Dict[str, float]]:
+        """mean/p95/max in ms per phase (plus the frame total) over the ring buffer."""
+        out = {}
+        if not self.frames:
+            return out
+        cols = list(zip(*self.frames))
+        cols.append(tuple(map(sum, self.frames)))
+        for phase, col in zip(PHASES + ("total",), cols):
+            ms = sorted(v / 1e6 for v in col)
+            out[phase] = {
+                "mean": sum(ms) / len(ms),
+                "p95": ms[min(len(ms) - 1, int(0.95 * len(ms)))],
+                "max": ms[-1],
+            }
+        return out
+
+    def draw(self, surf: pygame.Surface, pos: Tuple[int, int] = None):
+        if self._graph is None:
+            return
+        x, y = pos if pos is not None else (surf.get_width() - self.GRAPH_W - 10, 10)
+        surf.blit(self._graph, (x, y))
+        # the numbers only refresh 4x per second, so the text cache mostly hits
+        now = pygame.time.get_ticks()
+        if now - self._labels_at >= 250 or not self._labels:
+            s = self.summary()
+            self._labels = [f"{p} {s[p]['mean']:5.2f} ms" for p in PHASES]
+            self._labels.append(f"frame {s['total']['mean']:5.2f} ms  p95 {s['total']['p95']:5.2f}")
+            self._labels_at = now
+        ty = y + self.GRAPH_H + 2
+        colors = PHASE_COLORS + ((230, 230, 230),)
+        for text, color in zip(self._labels, colors):
+            surf.blit(render_text(text, color, ("consolas", 14)), (x, ty))
+            ty += 14
+
+    # ---- trace ----
+    def dump(self, path: str = None):
+        path = path or self.path
+        rows = [(i, *(ns / 1e6 for ns in f), sum(f) / 1e6)
+                for i, f in enumerate(self.frames, start=self.total_frames - len(self.frames))]
+        header = ("frame",) + tuple(f"{p}_ms" for p in PHASES) + ("total_ms",)
+        if path.endswith(".json"):
+            with open(path, "w") as fh:
+                json.dump({"demo": self.name, "phases": list(PHASES), "total_frames": self.total_frames,
+                           "summary": self.summary(), "frames": [dict(zip(header, r)) for r in rows]},
+                          fh, indent=2)
+        else:
+            with open(path, "w", newline="") as fh:
+                w = csv.writer(fh)
+                w.writerow(header)
+                w.writerows(rows)
+
+    def close(self):
+        if self._closed:
+            return
+        self._closed = True
+        if self.frames:
+            self.dump()
+            print(f"[profile] {self.name}: {len(self.frames)} frames -> {self.path}")
+
+class NullProfiler:
+    """Stand-in when profiling is off: same calls, no work."""
+    def begin_frame(self): pass
+    def mark(self, phase: str): pass
+    def draw(self, surf, pos=None): pass
+    def close(self): pass
+
+def frame_profiler(name: str):
+    """
+    Profiler for demo `name`, or a NullProfiler unless FRAME_PROFILE is set:
+        FRAME_PROFILE=1                 -> writes profile_<name>.csv
+        FRAME_PROFILE=trace.json        -> writes that file (.csv or .json)
+        FRAME_PROFILE_FRAMES=1200       -> ring-buffer size (default 600)
+    """
+    target = os.environ.get("FRAME_PROFILE", "")
+    if target in ("", "0"):
+        return NullProfiler()
+    path = f"profile_{name}.csv" if target == "1" else target
+    return FrameProfiler(name, path, int(os.environ.get("FRAME_PROFILE_FRAMES", "600")))
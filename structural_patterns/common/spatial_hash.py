@@ -0,0 +1,120 @@
+"""
+Uniform-grid broad phase (spatial hash) shared by the demos.
+
+Items are binned once per frame by the cells their Rect overlaps; a query only
+looks at the cells its own Rect overlaps, so N-vs-M overlap tests cost roughly
+O(N + M) instead of O(N * M) when things are spread out.
+
+Scaling vs the nested colliderect loop:
+    python spatial_hash.py --counts 500,1000,2000,4000
+"""
+from typing import Dict, Generic, Iterator, List, Tuple, TypeVar
+
+import pygame
+
+T = TypeVar("T")
+
+class SpatialHash(Generic[T]):
+    """
+    Grid of `cell`-sized buckets:
+      - insert(item, rect) stores one entry [rect, item, stamp] (its Rect
+        built once) in every overlapped cell
+      - hits(rect) yields each stored item whose Rect overlaps `rect`, once
+    Call clear() and re-insert when the items move (typically once per frame).
+    clear() drops every cell, so its cost and the memory held track the cells
+    in use this frame, not every cell an item has ever touched.
+    """
+    def __init__(self, cell: int = 64):
+        self.cell = cell
+        self._cells: Dict[Tuple[int, int], List[list]] = {}
+        self._stamp = 0                 # query id; an entry's stamp de-duplicates multi-cell items
+
+    def clear(self):
+        self._cells.clear()
+
+    def _span(self, rect: pygame.Rect):
+        c = self.cell
+        return range(rect.left // c, (rect.right - 1) // c + 1), range(rect.top // c, (rect.bottom - 1) // c + 1)
+
+    def insert(self, item: T, rect: pygame.Rect):
+        entry = [rect, item, 0]  # shared by all its cells
+        cols, rows = self._span(rect)
+        cells = self._cells
+        for cx in cols:
+            for cy in rows:
+                bucket = cells.get((cx, cy))
+                if bucket is None:
+                    bucket = cells[(cx, cy)] = []
+                bucket.append(entry)
+
+    def hits(self, rect: pygame.Rect) -> Iterator[T]:
+        cols, rows = self._span(rect)
+        multi = len(cols) > 1 or len(rows) > 1
+        if multi:
+            self._stamp += 1
+            stamp = self._stamp
+        cells = self._cells
+        for cx in cols:
+            for cy in rows:
+                bucket = cells.get((cx, cy))
+                if not bucket:
+                    continue
+                for entry in bucket:
+                    if not entry[0].colliderect(rect):
+                        continue
+                    if multi:
+                        if entry[2] == stamp:
+                            continue
+                        entry[2] = stamp
+                    yield entry[1]
+
+# =========================
+# Benchmark: grid vs nested loop
+# =========================
+def _random_rects(rng, n: int, w: int, h: int, size: Tuple[int, int]):
+    return [pygame.Rect(rng.randrange(0, w - size[0]), rng.randrange(0, h - size[1]), *size) for _ in range(n)]
+
+def benchmark(counts: List[int], world: Tuple[int, int] = (4000, 2400), cell: int = 64,
+              frames: int = 5, naive_max: int = 4000, seed: int = 0):
+    """ms per frame (bin targets + test every bullet) for each bullets=targets count."""
+    import random
+    import time
+    rng = random.Random(seed)
+    rows = []
+    for n in counts:
+        bullets = _random_rects(rng, n, *world, (8, 4))
+        targets = _random_rects(rng, n, *world, (32, 32))
+        grid: SpatialHash[int] = SpatialHash(cell)
+        t0 = time.perf_counter()
+        for _ in range(frames):
+            grid.clear()
+            for i, t in enumerate(targets):
+                grid.insert(i, t)
+            hits_grid = sum(1 for b in bullets for _ in grid.hits(b))
+        grid_ms = (time.perf_counter() - t0) * 1000 / frames
+        naive_ms = hits_naive = None
+        if n <= naive_max:
+            t0 = time.perf_counter()
+            hits_naive = sum(1 for b in bullets for t in targets if b.colliderect(t))
+            naive_ms = (time.perf_counter() - t0) * 1000
+            assert hits_naive == hits_grid, (hits_naive, hits_grid)
+        rows.append((n, hits_grid, naive_ms, grid_ms))
+    return rows
+
+if __name__ == "__main__":
+    import argparse
+    ap = argparse.ArgumentParser(description="SpatialHash broad phase vs nested colliderect loop")
+    ap.add_argument("--counts", default="500,1000,2000,4000", help="comma-separated bullets (= targets) counts")
+    ap.add_argument("--world", default="4000x2400", help="WxH area the entities are spread over")
+    ap.add_argument("--cell", type=int, default=64)
+    ap.add_argument("--naive-max", type=int, default=4000, help="skip the O(N*M) loop above this count")
+    args = ap.parse_args()
+
+    w, h = (int(v) for v in args.world.lower().split("x"))
+    counts = [int(c) for c in args.counts.split(",") if c.strip()]
+    print(f"world={w}x{h}  cell={args.cell}  (bullets 8x4, targets 32x32)")
+    print(f"{'entities':>9} {'hits':>6} {'nested ms':>10} {'grid ms':>8} {'speedup':>8}")
+    for n, hits, naive_ms, grid_ms in benchmark(counts, (w, h), args.cell, naive_max=args.naive_max):
+        nested = f"{naive_ms:10.1f}" if naive_ms is not None else f"{'-':>10}"
+        speed = f"{naive_ms / grid_ms:7.1f}x" if naive_ms is not None else f"{'-':>8}"
+        print(f"{n:>9} {hits:>6} {nested} {grid_ms:8.2f} {speed}")
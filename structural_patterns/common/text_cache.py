@@ -0,0 +1,63 @@
+import pygame
+from collections import OrderedDict
+from typing import Dict, Optional, Tuple
+
+FontKey = Tuple[Optional[str], int]  # (SysFont name or None for the default font, size)
+DEFAULT_FONT: FontKey = ("consolas", 18)
+
+# =========================
+# Shared HUD text cache
+# =========================
+class TextCache:
+    """
+    Text rendering for HUDs/hints, shared across demos:
+      - fonts are resolved once per (name, size); SysFont scans the system font list
+      - rendered lines are memoized per (text, color, font, antialias), LRU-evicted
+    Static hint lines cost one blit per frame; only lines whose text changes
+    (scores, FPS, timers) render again.
+    """
+    def __init__(self, max_lines: int = 256):
+        self.max_lines = max_lines
+        self._fonts: Dict[FontKey, pygame.font.Font] = {}
+        self._lines: "OrderedDict[tuple, pygame.Surface]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        # Font objects die with pygame.quit(); start fresh if the app re-inits
+        pygame.register_quit(self.clear)
+
+    def font(self, name: Optional[str] = DEFAULT_FONT[0], size: int = DEFAULT_FONT[1]) -> pygame.font.Font:
+        key = (name, size)
+        f = self._fonts.get(key)
+        if f is None:
+            if not pygame.font.get_init():
+                pygame.font.init()
+            f = pygame.font.SysFont(name, size)
+            self._fonts[key] = f
+        return f
+
+    def render(self, text: str, color, font: FontKey = DEFAULT_FONT, antialias: bool = True) -> pygame.Surface:
+        key = (text, tuple(color), font, antialias)
+        surf = self._lines.get(key)
+        if surf is not None:
+            self._lines.move_to_end(key)
+            self.hits += 1
+            return surf
+        self.misses += 1
+        surf = self.font(*font).render(text, antialias, color)
+        self._lines[key] = surf
+        if len(self._lines) > self.max_lines:
+            self._lines.popitem(last=False)  # least recently used
+        return surf
+
+    def clear(self):
+        self._fonts.clear()
+        self._lines.clear()
+
+_shared = TextCache()
+
+def get_text_cache() -> TextCache:
+    """The process-wide cache every demo renders through."""
+    return _shared
+
+def render_text(text: str, color, font: FontKey = DEFAULT_FONT, antialias: bool = True) -> pygame.Surface:
+    return _shared.render(text, color, font, antialias)
@@ -1,8 +1,15 @@
 import pygame
 import random
 import math
+import os
+import sys
 from typing import List, Protocol, runtime_checkable
 
+# structural_patterns/ on the path for the helpers shared by all demos (common/)
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from common.frame_profiler import frame_profiler
+from common.text_cache import render_text
+
 # =========================
 # Composite Pattern Types
 # =========================
@@ -170,13 +177,14 @@ def main():
     screen = pygame.display.set_mode((WIDTH, HEIGHT))
     pygame.display.set_caption("Composite Pattern – Wrap, Animate, Add/Remove")
     clock = pygame.time.Clock()
-    font = pygame.font.SysFont(None, 22)
 
     root_group = build_population()
 
+    prof = frame_profiler("composite")  # opt-in: FRAME_PROFILE=1
     running = True
     while running:
         dt = clock.tick(FPS) / 1000.0
+        prof.begin_frame()
         for event in pygame.event.get():
             if event.type == pygame.QUIT:
                 running = False
@@ -204,6 +212,7 @@ def main():
         if keys[pygame.K_RIGHT]: dx += SPEED
         if keys[pygame.K_UP]:    dy -= SPEED
         if keys[pygame.K_DOWN]:  dy += SPEED
+        prof.mark("event")
 
         moving = (dx != 0 or dy != 0)
         mag = math.hypot(dx, dy) or 1.0
@@ -213,6 +222,7 @@ def main():
             root_group.move(dx, dy)
 
         root_group.update(dt, moving, dirx, diry)
+        prof.mark("update")
 
         # Render
         screen.fill(BG_COLOR)
@@ -224,13 +234,17 @@ def main():
             "ESC: quit",
         ]
         for i, text in enumerate(hint_lines):
-            screen.blit(font.render(text, True, (205, 205, 205)), (12, 12 + i*20))
+            screen.blit(render_text(text, (205, 205, 205), (None, 22)), (12, 12 + i*20))
+        prof.draw(screen)
+        prof.mark("render")
 
         pygame.display.flip()
+        prof.mark("flip")
 
         if keys[pygame.K_ESCAPE]:
             running = False
 
+    prof.close()
     pygame.quit()
 
 if __name__ == "__main__":
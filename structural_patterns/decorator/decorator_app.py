@@ -1,12 +1,21 @@
 import pygame
 import random
 import math
+import os
+import sys
 from abc import ABC, abstractmethod
 
+# structural_patterns/ on the path for the helpers shared by all demos (common/)
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from common.fixed_step import FixedStepLoop, add_loop_args, lerp
+from common.frame_profiler import frame_profiler
+from common.text_cache import render_text
+
 # ======== Basic Setup ========
 WIDTH, HEIGHT = 960, 540
 GROUND_Y = HEIGHT - 80
 FPS = 60
+STEP_HZ = 120  # fixed simulation rate (independent of FPS)
 
 WHITE = (245, 245, 245)
 BLACK = (30, 30, 30)
@@ -17,22 +26,18 @@ YELLOW = (250, 210, 60)
 PURPLE = (175, 90, 255)
 RED = (235, 80, 70)
 
-pygame.init()
-pygame.display.set_caption("Decorator Runner (pygame)")
-screen = pygame.display.set_mode((WIDTH, HEIGHT))
-clock = pygame.time.Clock()
-font = pygame.font.SysFont("consolas", 18)
-
 # ======== Character Component Abstraction ========
 class ICharacter(ABC):
     """Interface for the character so decorators can wrap it."""
     @abstractmethod
     def update(self, dt, keys): ...
     @abstractmethod
-    def draw(self, surf): ...
+    def draw(self, surf, alpha=1.0): ...
     @abstractmethod
     def get_rect(self) -> pygame.Rect: ...
     @abstractmethod
+    def get_render_rect(self, alpha: float) -> pygame.Rect: ...
+    @abstractmethod
     def get_base_speed(self) -> float: ...
     @abstractmethod
     def get_move_speed(self) -> float: ...
@@ -52,6 +57,7 @@ class SimpleCharacter(ICharacter):
         self.h = 64
         self.x = x
         self.y = y
+        self.prev_x, self.prev_y = x, y  # state before the last step (interpolation)
         self.vx = 0
         self.vy = 0
         self.on_ground = False
@@ -71,6 +77,10 @@ class SimpleCharacter(ICharacter):
     def get_rect(self):
         return pygame.Rect(int(self.x), int(self.y), self.w, self.h)
 
+    def get_render_rect(self, alpha):
+        # blend the last two fixed steps so motion stays smooth at any render rate
+        return pygame.Rect(int(lerp(self.prev_x, self.x, alpha)), int(lerp(self.prev_y, self.y, alpha)), self.w, self.h)
+
     def get_base_speed(self):  # not modified by decorators
         return self._base_speed
 
@@ -96,6 +106,8 @@ class SimpleCharacter(ICharacter):
         }
 
     def _physics(self, dt, keys):
+        self.prev_x, self.prev_y = self.x, self.y
+
         # horizontal input
         ax = 0
         speed = self.get_move_speed()
@@ -137,9 +149,9 @@ class SimpleCharacter(ICharacter):
     def update(self, dt, keys):
         self._physics(dt, keys)
 
-    def draw(self, surf):
+    def draw(self, surf, alpha=1.0):
         # body
-        rect = self.get_rect()
+        rect = self.get_render_rect(alpha)
         pygame.draw.rect(surf, self.color, rect, border_radius=10)
         # face direction line
         cx = rect.centerx + (10 * self.facing)
@@ -158,8 +170,9 @@ class CharacterDecorator(ICharacter):
 
     # forwarding
     def update(self, dt, keys): self.wrappee.update(dt, keys)
-    def draw(self, surf): self.wrappee.draw(surf)
+    def draw(self, surf, alpha=1.0): self.wrappee.draw(surf, alpha)
     def get_rect(self): return self.wrappee.get_rect()
+    def get_render_rect(self, alpha): return self.wrappee.get_render_rect(alpha)
     def get_base_speed(self): return self.wrappee.get_base_speed()
     def get_move_speed(self): return self.wrappee.get_move_speed()
     def get_jump_power(self): return self.wrappee.get_jump_power()
@@ -189,11 +202,11 @@ class SpeedBoost(TimedDecorator):
     def get_move_speed(self):
         return self.wrappee.get_move_speed() * self.multiplier
 
-    def draw(self, surf):
+    def draw(self, surf, alpha=1.0):
         # aura
-        rect = self.get_rect().inflate(12, 12)
+        rect = self.get_render_rect(alpha).inflate(12, 12)
         pygame.draw.rect(surf, YELLOW, rect, width=3, border_radius=12)
-        super().draw(surf)
+        super().draw(surf, alpha)
 
 class JumpBoost(TimedDecorator):
     def __init__(self, wrappee: ICharacter, duration=6.0, bonus=240.0):
@@ -203,10 +216,10 @@ class JumpBoost(TimedDecorator):
     def get_jump_power(self):
         return self.wrappee.get_jump_power() + self.bonus
 
-    def draw(self, surf):
-        rect = self.get_rect().inflate(8, 8)
+    def draw(self, surf, alpha=1.0):
+        rect = self.get_render_rect(alpha).inflate(8, 8)
         pygame.draw.rect(surf, PURPLE, rect, width=3, border_radius=10)
-        super().draw(surf)
+        super().draw(surf, alpha)
 
 class Shield(TimedDecorator):
     def __init__(self, wrappee: ICharacter, duration=8.0):
@@ -215,10 +228,10 @@ class Shield(TimedDecorator):
     def is_shielded(self):
         return True
 
-    def draw(self, surf):
-        rect = self.get_rect().inflate(20, 20)
+    def draw(self, surf, alpha=1.0):
+        rect = self.get_render_rect(alpha).inflate(20, 20)
         pygame.draw.ellipse(surf, (80, 200, 255), rect, width=3)
-        super().draw(surf)
+        super().draw(surf, alpha)
 
 # ======== World Objects (pickups & hazards) ========
 class Pickup:
@@ -288,8 +301,8 @@ def draw_ground(surf):
 
 def draw_ui(surf, character: ICharacter, active_effects: list[TimedDecorator], score: int):
     # HP and Score
-    hp_text = font.render(f"HP: {character.get_state()['hp']}", True, WHITE)
-    score_text = font.render(f"Score: {score}", True, WHITE)
+    hp_text = render_text(f"HP: {character.get_state()['hp']}", WHITE)
+    score_text = render_text(f"Score: {score}", WHITE)
     surf.blit(hp_text, (12, 10))
     surf.blit(score_text, (12, 32))
 
@@ -313,11 +326,16 @@ def draw_ui(surf, character: ICharacter, active_effects: list[TimedDecorator], s
         pct = max(0.0, min(1.0, remaining / 8.0))  # 8s scale looks nice
         pygame.draw.rect(surf, GRAY, (x0, y0, bar_w, 10), border_radius=3)
         pygame.draw.rect(surf, c, (x0, y0, int(bar_w * pct), 10), border_radius=3)
-        label_text = font.render(f"{label} {remaining:0.1f}s", True, WHITE)
+        label_text = render_text(f"{label} {remaining:0.1f}s", WHITE)
         surf.blit(label_text, (x0 + bar_w + 8, y0 - 4))
         y0 += 18
 
-def main():
+def main(headless_steps: int = None, steps_per_frame: int = 1):
+    pygame.init()
+    pygame.display.set_caption("Decorator Runner (pygame)")
+    screen = pygame.display.set_mode((WIDTH, HEIGHT))
+    loop = FixedStepLoop(STEP_HZ, FPS, headless=headless_steps is not None,
+                         steps_per_frame=steps_per_frame, max_steps=headless_steps)
     random.seed(7)
 
     # world
@@ -326,50 +344,57 @@ def main():
 
     score = 0
     running = True
+    prof = frame_profiler("decorator")  # opt-in: FRAME_PROFILE=1
 
     while running:
-        dt = clock.tick(FPS) / 1000.0
+        steps = loop.advance()
+        prof.begin_frame()
         for e in pygame.event.get():
             if e.type == pygame.QUIT:
                 running = False
 
         keys = pygame.key.get_pressed()
-
-        # Update character (decorators can modify behavior)
-        character.update(dt, keys)
-
-        # Check collisions with pickups
-        crect = character.get_rect()
-        acquired = []
-        for p in pickups:
-            if crect.colliderect(p.rect):
-                if p.kind == "speed":
-                    character = add_decorator(character, lambda w: SpeedBoost(w, duration=6.0, multiplier=1.6))
-                elif p.kind == "jump":
-                    character = add_decorator(character, lambda w: JumpBoost(w, duration=6.0, bonus=240.0))
-                elif p.kind == "shield":
-                    character = add_decorator(character, lambda w: Shield(w, duration=8.0))
-                acquired.append(p)
-                score += 10
-        for p in acquired:
-            pickups.remove(p)
-
-        # Collisions with hazards
-        for h in hazards[:]:
-            if crect.colliderect(h.rect):
-                character.damage(1)
-                hazards.remove(h)   # consume the hazard
-                score = max(0, score - 5)
-
-        # Strip expired decorators
-        character = strip_expired_decorators(character)
-
-        # Respawn world items occasionally (keep the playground alive)
-        if random.random() < 0.01 and len(pickups) < 7:
-            kind = random.choice(["speed", "jump", "shield"])
-            pickups.append(Pickup(random.randint(80, WIDTH - 80), kind))
-        if random.random() < 0.008 and len(hazards) < 6:
-            hazards.append(Hazard(random.randint(80, WIDTH - 80)))
+        prof.mark("event")
+
+        # Fixed steps: a slow frame runs several small steps, never one huge one
+        for _ in range(steps):
+            dt = loop.dt
+            # Update character (decorators can modify behavior)
+            character.update(dt, keys)
+
+            # Check collisions with pickups
+            crect = character.get_rect()
+            acquired = []
+            for p in pickups:
+                if crect.colliderect(p.rect):
+                    if p.kind == "speed":
+                        character = add_decorator(character, lambda w: SpeedBoost(w, duration=6.0, multiplier=1.6))
+                    elif p.kind == "jump":
+                        character = add_decorator(character, lambda w: JumpBoost(w, duration=6.0, bonus=240.0))
+                    elif p.kind == "shield":
+                        character = add_decorator(character, lambda w: Shield(w, duration=8.0))
+                    acquired.append(p)
+                    score += 10
+            for p in acquired:
+                pickups.remove(p)
+
+            # Collisions with hazards
+            for h in hazards[:]:
+                if crect.colliderect(h.rect):
+                    character.damage(1)
+                    hazards.remove(h)   # consume the hazard
+                    score = max(0, score - 5)
+
+            # Strip expired decorators
+            character = strip_expired_decorators(character)
+
+            # Respawn world items occasionally (keep the playground alive)
+            if random.random() < 0.6 * dt and len(pickups) < 7:
+                kind = random.choice(["speed", "jump", "shield"])
+                pickups.append(Pickup(random.randint(80, WIDTH - 80), kind))
+            if random.random() < 0.48 * dt and len(hazards) < 6:
+                hazards.append(Hazard(random.randint(80, WIDTH - 80)))
+        prof.mark("update")
 
         # ======== RENDER ========
         screen.fill((25, 28, 35))
@@ -388,19 +413,31 @@ def main():
                 active_effects.append(tmp)
             tmp = tmp.wrappee
 
-        character.draw(screen)
+        character.draw(screen, loop.alpha)
         draw_ui(screen, character, active_effects, score)
 
         # Game over banner
         if character.get_state()["hp"] <= 0:
-            banner = font.render("Game Over — press ESC to quit", True, RED)
+            banner = render_text("Game Over — press ESC to quit", RED)
             screen.blit(banner, (WIDTH // 2 - banner.get_width() // 2, 10))
             if keys[pygame.K_ESCAPE]:
                 running = False
+        prof.draw(screen)
+        prof.mark("render")
 
         pygame.display.flip()
+        prof.mark("flip")
+        if loop.done:
+            running = False
 
+    prof.close()
+    if loop.headless:
+        print(f"[decorator] {loop.report()}")
     pygame.quit()
 
 if __name__ == "__main__":
-    main()
+    import argparse
+    args = add_loop_args(argparse.ArgumentParser(description="Decorator pattern demo")).parse_args()
+    if args.headless:
+        os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    main(args.headless, args.steps_per_frame)
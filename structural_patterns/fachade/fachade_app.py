@@ -1,6 +1,17 @@
-import pygame, random, math
+import pygame, random, math, os, sys, gc, time
 from dataclasses import dataclass
-from typing import List, Tuple
+from typing import Callable, Generic, List, Tuple, TypeVar
+
+try:
+    import numpy as np  # optional: vectorized ParticleSystem
+except ImportError:
+    np = None
+
+# structural_patterns/ on the path for the helpers shared by all demos (common/)
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from common.frame_profiler import frame_profiler
+from common.spatial_hash import SpatialHash
+from common.text_cache import render_text
 
 # =========================
 # Config
@@ -22,12 +33,22 @@ GREEN = (80, 200, 120)
 # Subsystems (hidden behind the Facade)
 # =========================
 class Camera:
-    """Very small camera with screen shake."""
-    def __init__(self):
+    """
+    Very small camera with screen shake, owning the world render target:
+      - begin(screen, static) copies the cached static layer into the surface
+        the scene is drawn on, in world coordinates (no per-draw offsets)
+      - present(screen) applies the shake with a single blit
+    While the camera is still, the screen itself is the target and present()
+    has nothing to do.
+    """
+    def __init__(self, bg=BG):
         self.offset_x = 0
         self.offset_y = 0
         self.shake_t = 0.0
         self.shake_amp = 0.0
+        self.bg = bg              # shows through the edges the shake uncovers
+        self._world = None        # offscreen target, created on the first shake
+        self._target = None
 
     def update(self, dt: float):
         if self.shake_t > 0:
@@ -41,41 +62,145 @@ class Camera:
         self.shake_amp = amp
         self.shake_t = max(self.shake_t, dur)
 
-class AudioMixer:
-    """Tiny sound wrapper (safe even if mixer not available)."""
-    def __init__(self):
+    def begin(self, screen: pygame.Surface, static: pygame.Surface) -> pygame.Surface:
+        target = screen
+        if self.offset_x or self.offset_y:
+            if self._world is None or self._world.get_size() != screen.get_size():
+                self._world = pygame.Surface(screen.get_size(), 0, screen)
+            target = self._world
+        target.blit(static, (0, 0))
+        self._target = target
+        return target
+
+    def present(self, screen: pygame.Surface):
+        if self._target is not None and self._target is not screen:
+            ox, oy = self.offset_x, self.offset_y
+            w, h = screen.get_size()
+            screen.blit(self._target, (ox, oy))
+            # only the strips the shake uncovered need clearing
+            if ox: screen.fill(self.bg, (0 if ox > 0 else w + ox, 0, abs(ox), h))
+            if oy: screen.fill(self.bg, (0, 0 if oy > 0 else h + oy, w, abs(oy)))
+        self._target = None
+
+class SoundBank:
+    """
+    Process-wide store of synthesized sounds, shared by every AudioMixer:
+      - the mixer is initialised once (or adopted if pygame.init() already did it)
+        and a fixed set of channels is reserved up front
+      - waveforms are memoized by (freq, ms, samplerate); with a cache_dir they
+        are also persisted as int16 .npy files, so later runs skip synthesis
+      - play() rotates through the reserved channels: O(1), never searches for
+        a free channel, the oldest cue is cut when all are busy
+    """
+    CHANNELS = 16
+    _shared = None
+
+    def __init__(self, cache_dir: str = None, samplerate: int = 22050):
+        self.cache_dir = cache_dir
+        self.samplerate = samplerate
         self.enabled = False
+        self.channels: List = []
+        self._next = 0
+        self._waves = {}   # (freq, ms, samplerate) -> int16 mono samples
+        self._sounds = {}  # (freq, ms, samplerate, channels) -> mixer.Sound
+        self._mixer_channels = 1
+
+    @classmethod
+    def shared(cls, cache_dir: str = None) -> "SoundBank":
+        """
+        The process-wide bank. A cache_dir given here is applied even if the
+        bank already exists: waveforms memoized so far stay in memory, later
+        ones are read from / written to the new directory. None leaves the
+        current setting alone.
+        """
+        if cls._shared is None:
+            cls._shared = cls(cache_dir)
+        elif cache_dir is not None:
+            cls._shared.cache_dir = cache_dir
+        return cls._shared
+
+    def start(self) -> bool:
+        """Initialise the mixer (once) and reserve the channels."""
+        if self.enabled:
+            return True
+        if np is None:
+            return False  # sounds are synthesized with NumPy
         try:
-            pygame.mixer.init()
+            if not pygame.mixer.get_init():
+                pygame.mixer.init(frequency=self.samplerate, size=-16, channels=1)
+            # pygame.init() may already have opened the mixer; use its real format
+            self.samplerate, _, self._mixer_channels = pygame.mixer.get_init()
+            pygame.mixer.set_num_channels(self.CHANNELS)
+            self.channels = [pygame.mixer.Channel(i) for i in range(self.CHANNELS)]
             self.enabled = True
-        except Exception:
+        except pygame.error:
             self.enabled = False
+        return self.enabled
+
+    def waveform(self, freq: int, ms: int, samplerate: int) -> "np.ndarray":
+        key = (freq, ms, samplerate)
+        wave = self._waves.get(key)
+        if wave is not None:
+            return wave
+        path = None
+        if self.cache_dir:
+            path = os.path.join(self.cache_dir, f"beep_{freq}_{ms}_{samplerate}.npy")
+            if os.path.exists(path):
+                wave = np.load(path)
+        if wave is None:
+            t = np.arange(int(samplerate * ms / 1000), dtype=np.float32) / samplerate
+            wave = (0.5 * 32767 * np.sin(2*math.pi*freq*t)).astype(np.int16)
+            if path:
+                os.makedirs(self.cache_dir, exist_ok=True)
+                np.save(path, wave)
+        self._waves[key] = wave
+        return wave
+
+    def beep(self, freq: int = 440, ms: int = 120):
+        """Shared Sound for a sine beep, or None when audio is unavailable."""
+        if not self.start():
+            return None
+        key = (freq, ms, self.samplerate, self._mixer_channels)
+        snd = self._sounds.get(key)
+        if snd is None:
+            wave = self.waveform(freq, ms, self.samplerate)
+            if self._mixer_channels > 1:  # make_sound wants one column per mixer channel
+                wave = np.repeat(wave[:, None], self._mixer_channels, axis=1)
+            snd = self._sounds[key] = pygame.sndarray.make_sound(np.ascontiguousarray(wave))
+        return snd
+
+    def play(self, snd):
+        if not self.enabled or snd is None:
+            return
+        self.channels[self._next].play(snd)
+        self._next = (self._next + 1) % len(self.channels)
+
+class AudioMixer:
+    """Tiny sound wrapper (safe even if mixer not available); sounds come from a shared SoundBank."""
+    def __init__(self, bank: SoundBank = None):
+        self.bank = bank or SoundBank.shared()
         self.sounds = {}
 
+    @property
+    def enabled(self) -> bool:
+        return self.bank.enabled
+
     def load_beep(self, name: str, freq: int = 440, ms: int = 120):
-        # generate a short beep (fallback if no files)
-        if not self.enabled: 
-            self.sounds[name] = None
-            return
-        import numpy as np
-        samplerate = 22050
-        t = np.linspace(0, ms/1000, int(samplerate*ms/1000), False)
-        wave = (0.5 * np.sin(2*math.pi*freq*t)).astype(np.float32)
-        snd = pygame.sndarray.make_sound((wave*32767).astype("int16"))
-        self.sounds[name] = snd
+        # generate a short beep (fallback if no files); synthesized once per process
+        self.sounds[name] = self.bank.beep(freq, ms)
 
     def play(self, name: str):
-        snd = self.sounds.get(name)
-        if self.enabled and snd:
-            snd.play()
+        self.bank.play(self.sounds.get(name))
 
 @dataclass
 class Particle:
     x: float; y: float; vx: float; vy: float; life: float; col: Tuple[int,int,int]; size: int
 
-class ParticleSystem:
+class ListParticleSystem:
+    """Original list-of-dataclasses particles; used when NumPy is not installed."""
     def __init__(self):
         self.particles: List[Particle] = []
+        self.surface_allocs = 0  # one temporary Surface per particle per frame
 
     def burst(self, x: float, y: float, n: int, base_col: Tuple[int,int,int]):
         for _ in range(n):
@@ -87,6 +212,10 @@ class ParticleSystem:
             col = tuple(max(0, min(255, c + random.randint(-30, 30))) for c in base_col)
             self.particles.append(Particle(x, y, vx, vy, life, col, size))
 
+    def burst_many(self, xs, ys, n: int, base_col: Tuple[int,int,int]):
+        for x, y in zip(xs, ys):
+            self.burst(x, y, n, base_col)
+
     def update(self, dt: float):
         alive = []
         for p in self.particles:
@@ -98,16 +227,158 @@ class ParticleSystem:
                 alive.append(p)
         self.particles = alive
 
-    def draw(self, surf: pygame.Surface, cam: Camera):
+    def draw(self, surf: pygame.Surface):
+        self.surface_allocs += len(self.particles)
         for p in self.particles:
             alpha = max(0, min(255, int(255 * (p.life / 0.8))))
             s = pygame.Surface((p.size, p.size), pygame.SRCALPHA)
             s.fill((*p.col, alpha))
-            surf.blit(s, (int(p.x + cam.offset_x), int(p.y + cam.offset_y)))
+            surf.blit(s, (int(p.x), int(p.y)))
+
+class SquareSprites:
+    """
+    Baked translucent particle squares, keyed on (size, color bucket, alpha bucket).
+    Burst colors are jittered per particle, so they are snapped to COLOR_STEP-wide
+    buckets and alpha to ALPHA_LEVELS levels. The table is built lazily and, once
+    warm, an explosion frame allocates no Surfaces at all.
+    """
+    COLOR_STEP = 16     # 16 buckets per channel
+    ALPHA_LEVELS = 16
+
+    def __init__(self):
+        self._table = {}
+        self.surface_allocs = 0
+
+    def __len__(self):
+        return len(self._table)
+
+    def keys(self, size, col, alpha):
+        """Vectorized table keys for NumPy columns (size, col[n,3], alpha 0..255)."""
+        q = 256 // self.COLOR_STEP
+        c = col.astype(np.int32) // self.COLOR_STEP
+        a = alpha.astype(np.int32) * (self.ALPHA_LEVELS - 1) // 255
+        return (((size.astype(np.int32) * q + c[:, 0]) * q + c[:, 1]) * q + c[:, 2]) * self.ALPHA_LEVELS + a
+
+    def get(self, key: int) -> pygame.Surface:
+        s = self._table.get(key)
+        if s is None:
+            s = self._table[key] = self._bake(key)
+        return s
+
+    def _bake(self, key: int) -> pygame.Surface:
+        q = 256 // self.COLOR_STEP
+        rest, a = divmod(key, self.ALPHA_LEVELS)
+        rest, b = divmod(rest, q)
+        rest, g = divmod(rest, q)
+        size, r = divmod(rest, q)
+        center = lambda bucket: min(255, bucket * self.COLOR_STEP + self.COLOR_STEP // 2)
+        s = pygame.Surface((size, size), pygame.SRCALPHA)
+        s.fill((center(r), center(g), center(b), a * 255 // (self.ALPHA_LEVELS - 1)))
+        self.surface_allocs += 1
+        return s
+
+class ParticleSystem:
+    """
+    Particles as preallocated NumPy columns (structure of arrays):
+      - burst()/burst_many() generate whole explosions with one RNG call per field
+      - update() integrates gravity/motion/lifetime for every particle at once
+      - dead particles are swap-removed: live ones from the tail fill the holes,
+        so particles [0:count] are always the live set and nothing is reallocated
+      - draw() blits shared SquareSprites in one Surface.blits() call
+    Capacity doubles when a burst does not fit.
+    """
+    GRAVITY = 500.0
+    LIFE_MAX = 0.8  # longest life a burst hands out; alpha fades over it
+
+    def __init__(self, capacity: int = 2048, seed: int = None):
+        self.capacity = 0
+        self.count = 0
+        self.rng = np.random.default_rng(seed)
+        self.sprites = SquareSprites()
+        self._grow(capacity)
+
+    @property
+    def surface_allocs(self) -> int:
+        return self.sprites.surface_allocs
+
+    def __len__(self):
+        return self.count
+
+    def _grow(self, min_capacity: int):
+        cap = max(min_capacity, self.capacity * 2)
+        def resized(old, shape, dtype):
+            arr = np.empty(shape, dtype=dtype)
+            if old is not None:
+                arr[:self.count] = old[:self.count]
+            return arr
+        for name in ("x", "y", "vx", "vy", "life"):
+            setattr(self, name, resized(getattr(self, name, None), cap, np.float32))
+        self.size = resized(getattr(self, "size", None), cap, np.uint8)
+        self.col = resized(getattr(self, "col", None), (cap, 3), np.uint8)
+        self.capacity = cap
+
+    def burst(self, x: float, y: float, n: int, base_col: Tuple[int,int,int]):
+        self.burst_many((x,), (y,), n, base_col)
+
+    def burst_many(self, xs, ys, n: int, base_col: Tuple[int,int,int]):
+        """`n` particles around each (xs[i], ys[i]), all in one vectorized pass."""
+        centers = len(xs)
+        total = centers * n
+        if total <= 0:
+            return
+        lo, hi = self.count, self.count + total
+        if hi > self.capacity:
+            self._grow(hi)
+        rng = self.rng
+        ang = rng.uniform(0, 2*math.pi, total)
+        spd = rng.uniform(80, 320, total)
+        self.x[lo:hi] = np.repeat(np.asarray(xs, dtype=np.float32), n)
+        self.y[lo:hi] = np.repeat(np.asarray(ys, dtype=np.float32), n)
+        self.vx[lo:hi] = np.cos(ang) * spd
+        self.vy[lo:hi] = np.sin(ang) * spd
+        self.life[lo:hi] = rng.uniform(0.3, self.LIFE_MAX, total)
+        self.size[lo:hi] = rng.integers(2, 6, total)
+        jitter = rng.integers(-30, 31, (total, 3))
+        self.col[lo:hi] = np.clip(np.asarray(base_col, dtype=np.int16) + jitter, 0, 255)
+        self.count = hi
+
+    def update(self, dt: float):
+        n = self.count
+        if n == 0:
+            return
+        life = self.life[:n]
+        life -= dt
+        self.x[:n] += self.vx[:n] * dt
+        self.y[:n] += self.vy[:n] * dt
+        self.vy[:n] += self.GRAVITY * dt
+        dead = np.flatnonzero(life <= 0)
+        if dead.size:
+            self._compact(dead)
+
+    def _compact(self, dead: np.ndarray):
+        # swap-remove: live particles past the new end move into the dead slots below it
+        n = self.count
+        keep = n - dead.size
+        holes = dead[dead < keep]
+        movers = keep + np.flatnonzero(self.life[keep:n] > 0)
+        if holes.size:
+            for arr in (self.x, self.y, self.vx, self.vy, self.life, self.size, self.col):
+                arr[holes] = arr[movers]
+        self.count = keep
+
+    def draw(self, surf: pygame.Surface):
+        n = self.count
+        if n == 0:
+            return
+        alpha = np.clip(255 * self.life[:n] / self.LIFE_MAX, 0, 255)
+        keys = self.sprites.keys(self.size[:n], self.col[:n], alpha).tolist()
+        xs = self.x[:n].astype(np.int32).tolist()
+        ys = self.y[:n].astype(np.int32).tolist()
+        # lazy pairs: temporaries die one by one, so a big frame does not trip the GC
+        surf.blits(zip(map(self.sprites.get, keys), zip(xs, ys)), doreturn=False)
 
 class HUD:
     def __init__(self):
-        self.font = pygame.font.SysFont("consolas", 18)
         self.score = 0
         self.toast = ""
         self.toast_t = 0.0
@@ -123,9 +394,9 @@ class HUD:
         if self.toast_t > 0: self.toast_t -= dt
 
     def draw(self, surf: pygame.Surface):
-        surf.blit(self.font.render(f"Score: {self.score}", True, WHITE), (10, 10))
+        surf.blit(render_text(f"Score: {self.score}", WHITE), (10, 10))
         if self.toast_t > 0:
-            msg = self.font.render(self.toast, True, YELLOW)
+            msg = render_text(self.toast, YELLOW)
             surf.blit(msg, (WIDTH//2 - msg.get_width()//2, 10))
 
 class FXLibrary:
@@ -145,12 +416,26 @@ class GameFXFacade:
       - audio cues
       - HUD (score/toast)
     Client code calls one method; facade coordinates subsystems.
+
+    With batched=True the on_* calls only record the event; update() then
+    coalesces the whole frame: one shake at the strongest amplitude, each
+    sound played once, one vectorized burst per (color, size) group and a
+    single score/toast update.
     """
-    def __init__(self, camera: Camera, particles: ParticleSystem, audio: AudioMixer, hud: HUD):
+    def __init__(self, camera: Camera, particles: ParticleSystem, audio: AudioMixer, hud: HUD,
+                 batched: bool = False):
         self.cam = camera
         self.ps = particles
         self.audio = audio
         self.hud = hud
+        self.batched = batched
+
+        # per-frame event buffer (batched mode)
+        self._bursts = {}      # (n, color) -> ([xs], [ys])
+        self._sounds = set()
+        self._shake = None     # (amp, dur) strongest request this frame
+        self._points = 0
+        self._kills = 0
 
         # Prepare simple beeps (if mixer available)
         self.audio.load_beep("shoot", 880, 70)
@@ -158,23 +443,68 @@ class GameFXFacade:
 
     # High-level, domain-specific API
     def on_shoot(self, x, y):
+        if self.batched:
+            self._queue_burst(x, y, 8, FXLibrary.SPARK)
+            self._sounds.add("shoot")
+            return
         self.ps.burst(x, y, 8, FXLibrary.SPARK)
         self.audio.play("shoot")
 
     def on_enemy_destroyed(self, x, y, points: int = 100):
+        if self.batched:
+            self._queue_burst(x, y, 40, FXLibrary.EXPLOSION)
+            self._queue_shake(6, 0.25)
+            self._sounds.add("explosion")
+            self._points += points
+            self._kills += 1
+            return
         self.ps.burst(x, y, 40, FXLibrary.EXPLOSION)
         self.cam.shake(amp=6, dur=0.25)
         self.audio.play("explosion")
         self.hud.add_score(points)
         self.hud.notify("+{}!".format(points))
 
+    # Batched mode: record now, apply once per frame in update()
+    def _queue_burst(self, x, y, n: int, color):
+        xs, ys = self._bursts.setdefault((n, color), ([], []))
+        xs.append(x); ys.append(y)
+
+    def _queue_shake(self, amp: float, dur: float):
+        if self._shake is None:
+            self._shake = (amp, dur)
+        else:
+            self._shake = (max(self._shake[0], amp), max(self._shake[1], dur))
+
+    def flush(self):
+        for (n, color), (xs, ys) in self._bursts.items():
+            self.ps.burst_many(xs, ys, n, color)
+        self._bursts.clear()
+        if self._shake is not None:
+            self.cam.shake(*self._shake)
+            self._shake = None
+        for name in self._sounds:
+            self.audio.play(name)
+        self._sounds.clear()
+        if self._kills:
+            self.hud.add_score(self._points)
+            self.hud.notify("+{}!".format(self._points) if self._kills == 1
+                            else "+{}! x{}".format(self._points, self._kills))
+            self._points = self._kills = 0
+
     def update(self, dt: float):
+        if self.batched:
+            self.flush()
         self.cam.update(dt)
         self.ps.update(dt)
         self.hud.update(dt)
 
-    def draw(self, surf: pygame.Surface):
-        self.ps.draw(surf, self.cam)
+    def begin_frame(self, screen: pygame.Surface, static: pygame.Surface) -> pygame.Surface:
+        """World-space surface for this frame, already holding the static layer."""
+        return self.cam.begin(screen, static)
+
+    def draw(self, surf: pygame.Surface, world: pygame.Surface = None):
+        self.ps.draw(surf if world is None else world)
+        self.cam.present(surf)
         self.hud.draw(surf)
 
 # =========================
@@ -212,14 +542,17 @@ class Player:
             self.on_ground = True
         self.x = max(0, min(self.x, WIDTH - self.w))
 
-    def draw(self, surf: pygame.Surface, cam: Camera):
-        r = self.rect().move(cam.offset_x, cam.offset_y)
+    def draw(self, surf: pygame.Surface):
+        r = self.rect()
         pygame.draw.rect(surf, BLUE, r, border_radius=10)
         eye = (r.centerx + self.facing*10, r.top + 18)
         pygame.draw.circle(surf, WHITE, eye, 3)
 
 class Bullet:
-    def __init__(self, x, y, dirx):
+    def __init__(self, x=0.0, y=0.0, dirx=1):
+        self.reset(x, y, dirx)
+
+    def reset(self, x, y, dirx):
         self.x, self.y = x, y
         self.vx = 520 * dirx
         self.alive = True
@@ -231,13 +564,16 @@ class Bullet:
 
     def rect(self): return pygame.Rect(int(self.x)-4, int(self.y)-2, 8, 4)
 
-    def draw(self, surf: pygame.Surface, cam: Camera):
-        pygame.draw.rect(surf, YELLOW, self.rect().move(cam.offset_x, cam.offset_y), border_radius=2)
+    def draw(self, surf: pygame.Surface):
+        pygame.draw.rect(surf, YELLOW, (int(self.x)-4, int(self.y)-2, 8, 4), border_radius=2)
 
 class Target:
-    def __init__(self, x, y):
-        self.x, self.y = x, y
+    def __init__(self, x=0.0, y=0.0):
         self.r = 16
+        self.reset(x, y)
+
+    def reset(self, x, y):
+        self.x, self.y = x, y
         self.alive = True
         self.base_x = x
         self.t = random.uniform(0, 3)
@@ -248,19 +584,108 @@ class Target:
 
     def rect(self): return pygame.Rect(int(self.x - self.r), int(self.y - self.r), self.r*2, self.r*2)
 
-    def draw(self, surf: pygame.Surface, cam: Camera):
-        pygame.draw.circle(surf, RED, (int(self.x + cam.offset_x), int(self.y + cam.offset_y)), self.r)
-        pygame.draw.circle(surf, WHITE, (int(self.x + cam.offset_x), int(self.y + cam.offset_y)), max(2, self.r//3), 2)
+    def draw(self, surf: pygame.Surface):
+        c = (int(self.x), int(self.y))
+        pygame.draw.circle(surf, RED, c, self.r)
+        pygame.draw.circle(surf, WHITE, c, max(2, self.r//3), 2)
+
+E = TypeVar("E")
+
+class EntityPool(Generic[E]):
+    """
+    Reusable entity objects with alive flags:
+      - items[:live] are the live entities; acquire(*args) re-initialises a
+        spare object with reset(*args) and only allocates when none is left
+      - compact() swap-removes dead entries in place (order is not kept)
+    A sustained stream of spawns/despawns allocates nothing once warm.
+    """
+    def __init__(self, factory: Callable[[], E], capacity: int = 0):
+        self.factory = factory
+        self.items: List[E] = [factory() for _ in range(capacity)]
+        self.live = 0
+
+    def __len__(self):
+        return self.live
+
+    def __iter__(self):
+        items = self.items
+        for i in range(self.live):
+            yield items[i]
+
+    def acquire(self, *args) -> E:
+        if self.live == len(self.items):
+            self.items.append(self.factory())
+        obj = self.items[self.live]
+        obj.reset(*args)
+        self.live += 1
+        return obj
+
+    def compact(self):
+        items, i = self.items, 0
+        while i < self.live:
+            if items[i].alive:
+                i += 1
+            else:
+                self.live -= 1
+                items[i], items[self.live] = items[self.live], items[i]
+
+    def clear(self):
+        self.live = 0
+
+class EntityList(Generic[E]):
+    """Allocating counterpart of EntityPool (new object per spawn, list rebuilt per frame); for comparison."""
+    def __init__(self, factory: Callable[..., E], capacity: int = 0):
+        self.factory = factory
+        self.items: List[E] = []
+
+    def __len__(self):
+        return len(self.items)
+
+    def __iter__(self):
+        return iter(self.items)
+
+    def acquire(self, *args) -> E:
+        obj = self.factory(*args)
+        self.items.append(obj)
+        return obj
+
+    def compact(self):
+        self.items = [e for e in self.items if e.alive]
+
+    def clear(self):
+        self.items = []
+
+class GCStats:
+    """Counts garbage collections per generation (via gc.callbacks) while the demo runs."""
+    def __init__(self):
+        self.counts = [0, 0, 0]
+        self.t0 = time.perf_counter()
+        gc.callbacks.append(self._on_gc)
+
+    def _on_gc(self, phase, info):
+        if phase == "stop":
+            self.counts[info["generation"]] += 1
+
+    def per_sec(self) -> List[float]:
+        secs = max(1e-9, time.perf_counter() - self.t0)
+        return [c / secs for c in self.counts]
+
+    def close(self):
+        if self._on_gc in gc.callbacks:
+            gc.callbacks.remove(self._on_gc)
 
 # =========================
 # Helpers
 # =========================
-def draw_ground(surf, cam: Camera):
-    pygame.draw.rect(surf, GROUND, (0 + cam.offset_x, GROUND_Y + cam.offset_y, WIDTH, HEIGHT - GROUND_Y))
-    pygame.draw.line(surf, (70, 76, 84), (0 + cam.offset_x, GROUND_Y + cam.offset_y), (WIDTH + cam.offset_x, GROUND_Y + cam.offset_y), 2)
+def build_static_layer(screen) -> pygame.Surface:
+    """Background and ground, drawn once; every frame starts from a copy of it."""
+    surf = pygame.Surface((WIDTH, HEIGHT), 0, screen)
+    surf.fill(BG)
+    pygame.draw.rect(surf, GROUND, (0, GROUND_Y, WIDTH, HEIGHT - GROUND_Y))
+    pygame.draw.line(surf, (70, 76, 84), (0, GROUND_Y), (WIDTH, GROUND_Y), 2)
+    return surf
 
 def draw_hint(surf):
-    font = pygame.font.SysFont("consolas", 18)
     lines = [
         "Facade Pattern demo — one call triggers particles + camera shake + sound + HUD",
         "Move: A/D or Left/Right | Shoot: SPACE | ESC: quit",
@@ -268,33 +693,45 @@ def draw_hint(surf):
     y = 10
     for i, t in enumerate(lines):
         c = WHITE if i == 0 else (210,210,210)
-        surf.blit(font.render(t, True, c), (12, y)); y += 20
+        surf.blit(render_text(t, c), (12, y)); y += 20
 
 # =========================
 # Main
 # =========================
-def main():
+def main(sound_cache: str = None, batched: bool = False, pooled: bool = True, autofire: int = 0):
+    pygame.mixer.pre_init(22050, -16, 1)  # the bank adopts whatever format the mixer ends up with
     pygame.init()
     screen = pygame.display.set_mode((WIDTH, HEIGHT))
     pygame.display.set_caption("Facade Pattern with pygame — GameFX Facade")
     clock = pygame.time.Clock()
+    SoundBank.shared(sound_cache).start()  # mixer + reserved channels, once per process
 
     # Subsystems
     camera = Camera()
-    particles = ParticleSystem()
+    particles = ParticleSystem() if np is not None else ListParticleSystem()
     audio = AudioMixer()
     hud = HUD()
 
     # The Facade wrapping all those subsystems
-    fx = GameFXFacade(camera, particles, audio, hud)
+    fx = GameFXFacade(camera, particles, audio, hud, batched=batched)
 
     player = Player(120, GROUND_Y - 64)
-    bullets: List[Bullet] = []
-    targets: List[Target] = [Target(500 + i*90, GROUND_Y - 100 - (i%2)*40) for i in range(4)]
-
+    store = EntityPool if pooled else EntityList
+    bullets = store(Bullet, capacity=256)
+    targets = store(Target, capacity=4)
+    def spawn_targets():
+        for i in range(4):
+            targets.acquire(500 + i*90, GROUND_Y - 100 - (i%2)*40)
+    spawn_targets()
+    gc_stats = GCStats()
+    grid: SpatialHash[Target] = SpatialHash(cell=64)
+    static = build_static_layer(screen)
+
+    prof = frame_profiler("fachade")  # opt-in: FRAME_PROFILE=1
     running = True
     while running:
         dt = clock.tick(FPS) / 1000.0
+        prof.begin_frame()
 
         for e in pygame.event.get():
             if e.type == pygame.QUIT: running = False
@@ -302,46 +739,79 @@ def main():
             elif e.type == pygame.KEYDOWN and e.key == pygame.K_SPACE:
                 # Shoot: create bullet & call a simple facade hook
                 dirx = 1 if player.facing >= 0 else -1
-                b = Bullet(player.rect().centerx + dirx*28, player.rect().centery - 10, dirx)
-                bullets.append(b)
+                b = bullets.acquire(player.rect().centerx + dirx*28, player.rect().centery - 10, dirx)
+                fx.on_shoot(b.x, b.y)
+        if autofire:
+            # stress mode: a sustained stream of bullets across the targets' band
+            dirx = 1 if player.facing >= 0 else -1
+            px = player.rect().centerx + dirx*28
+            for _ in range(autofire):
+                b = bullets.acquire(px, random.uniform(GROUND_Y - 170, GROUND_Y - 20), dirx)
                 fx.on_shoot(b.x, b.y)
 
         keys = pygame.key.get_pressed()
+        prof.mark("event")
         player.update(dt, keys)
         for b in bullets: b.update(dt)
         for t in targets: t.update(dt)
 
-        # collisions bullet vs targets
+        # collisions bullet vs targets: bin targets once, test bullets against nearby cells only
+        grid.clear()
+        for t in targets:
+            if t.alive: grid.insert(t, t.rect())
         for b in bullets:
             if not b.alive: continue
-            br = b.rect()
-            for t in targets:
-                if t.alive and br.colliderect(t.rect()):
+            for t in grid.hits(b.rect()):
+                if t.alive:
                     t.alive = False
                     b.alive = False
                     fx.on_enemy_destroyed(t.x, t.y, points=100)
 
-        # cleanup
-        bullets = [b for b in bullets if b.alive]
-        targets = [t for t in targets if t.alive] or targets  # respawn if all dead
-        if all(not t.alive for t in targets):
-            targets = [Target(500 + i*90, GROUND_Y - 100 - (i%2)*40) for i in range(4)]
+        # cleanup (in place when pooled); respawn the targets once all are down
+        bullets.compact()
+        targets.compact()
+        if len(targets) == 0:
+            spawn_targets()
 
         # Update facade (updates subsystems)
         fx.update(dt)
-
-        # render
-        screen.fill(BG)
-        draw_ground(screen, camera)
-        for t in targets: t.draw(screen, camera)
-        for b in bullets: b.draw(screen, camera)
-        player.draw(screen, camera)
-        fx.draw(screen)
+        prof.mark("update")
+
+        # render: the scene in world coordinates, then shake + HUD in fx.draw
+        world = fx.begin_frame(screen, static)
+        for t in targets: t.draw(world)
+        for b in bullets: b.draw(world)
+        player.draw(world)
+        fx.draw(screen, world)
         draw_hint(screen)
+        if autofire:
+            g0, g1, g2 = gc_stats.per_sec()
+            stats = (f"autofire {autofire}/frame  bullets {len(bullets)}  {'pooled' if pooled else 'allocating'}  "
+                     f"GC/s gen0 {g0:4.1f} gen1 {g1:4.2f} gen2 {g2:4.2f}")
+            screen.blit(render_text(stats, YELLOW), (12, 52))
+        prof.draw(screen)
+        prof.mark("render")
 
         pygame.display.flip()
-
+        prof.mark("flip")
+
+    prof.close()
+    gc_stats.close()
+    if autofire:
+        g0, g1, g2 = gc_stats.per_sec()
+        print(f"[fachade] {'pooled' if pooled else 'allocating'} autofire={autofire}: "
+              f"GC collections/s gen0 {g0:.2f}  gen1 {g1:.2f}  gen2 {g2:.2f}")
     pygame.quit()
 
 if __name__ == "__main__":
-    main()
+    import argparse
+    ap = argparse.ArgumentParser(description="Facade pattern demo")
+    ap.add_argument("--sound-cache", metavar="DIR", help="persist synthesized beeps as int16 .npy files in DIR")
+    ap.add_argument("--batched", action="store_true",
+                    help="queue facade events and coalesce them once per frame in update()")
+    ap.add_argument("--autofire", type=int, default=0, metavar="N",
+                    help="stress mode: fire N bullets every frame and show GC collections/s")
+    ap.add_argument("--no-pool", action="store_true",
+                    help="allocate entities and rebuild lists each frame (the pre-pooling behaviour)")
+    args = ap.parse_args()
+    main(args.sound_cache, args.batched, not args.no_pool, args.autofire)
@@ -0,0 +1,117 @@
+"""
+Headless effects benchmark for the Facade demo.
+
+Fires E explosions (40 particles each) every K frames through the particle
+system, then times update and draw separately and counts the Surfaces the
+draw path allocates (SDL_VIDEODRIVER=dummy, no clock cap). Results are JSON.
+
+    python fx_bench.py                                  # list vs numpy, 10/100/300 explosions
+    python fx_bench.py --explosions 300 --backend numpy --frames 600
+"""
+import os
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+
+import argparse
+import itertools
+import json
+import platform
+import random
+import sys
+import time
+from typing import Dict, List
+
+import numpy as np
+import pygame
+
+import fachade_app as app
+
+BACKENDS = {"list": app.ListParticleSystem, "numpy": app.ParticleSystem}
+
+def _percentiles(ns: List[int]) -> Dict[str, float]:
+    ms = np.asarray(ns, dtype=np.float64) / 1e6
+    p50, p95, p99 = np.percentile(ms, [50, 95, 99])
+    return {"mean": float(ms.mean()), "p50": float(p50), "p95": float(p95), "p99": float(p99)}
+
+def run_config(cfg: dict, screen: pygame.Surface) -> dict:
+    random.seed(cfg["seed"])
+    ps = BACKENDS[cfg["backend"]]()
+    rng = np.random.default_rng(cfg["seed"])
+    dt = 1.0 / app.FPS
+    update_ns, draw_ns, drawn = [], [], []
+    allocs0 = 0
+    for frame in range(cfg["warmup"] + cfg["frames"]):
+        if frame == cfg["warmup"]:
+            allocs0 = ps.surface_allocs
+        if frame % cfg["every"] == 0:
+            xs = rng.uniform(0, app.WIDTH, cfg["explosions"])
+            ys = rng.uniform(0, app.GROUND_Y, cfg["explosions"])
+            for x, y in zip(xs.tolist(), ys.tolist()):
+                ps.burst(x, y, 40, app.FXLibrary.EXPLOSION)
+        t0 = time.perf_counter_ns()
+        ps.update(dt)
+        t1 = time.perf_counter_ns()
+        screen.fill(app.BG)
+        ps.draw(screen)
+        t2 = time.perf_counter_ns()
+        pygame.display.flip()
+        if frame >= cfg["warmup"]:
+            update_ns.append(t1 - t0)
+            draw_ns.append(t2 - t1)
+            drawn.append(len(ps.particles) if cfg["backend"] == "list" else len(ps))
+    allocs = ps.surface_allocs - allocs0
+    wall_s = (sum(update_ns) + sum(draw_ns)) / 1e9
+    return {
+        "config": cfg,
+        "update_ms": _percentiles(update_ns),
+        "draw_ms": _percentiles(draw_ns),
+        "particles_mean": float(np.mean(drawn)),
+        "surface_allocs_per_frame": allocs / cfg["frames"],
+        "surface_allocs_per_sec": allocs / wall_s if wall_s else None,
+        "sprite_table": len(ps.sprites) if hasattr(ps, "sprites") else None,
+    }
+
+def _csv(kind):
+    return lambda s: [kind(v.strip()) for v in s.split(",") if v.strip()]
+
+def main(argv=None) -> int:
+    ap = argparse.ArgumentParser(description="Headless particle/effects benchmark (Facade demo)")
+    ap.add_argument("--backend", type=_csv(str), default=list(BACKENDS), help="list,numpy")
+    ap.add_argument("--explosions", type=_csv(int), default=[10, 100, 300], help="explosions per burst frame")
+    ap.add_argument("--every", type=int, default=10, help="frames between burst frames")
+    ap.add_argument("--frames", type=int, default=300)
+    ap.add_argument("--warmup", type=int, default=30)
+    ap.add_argument("--seed", type=int, default=1234)
+    ap.add_argument("--out", help="write JSON here instead of stdout")
+    args = ap.parse_args(argv)
+
+    for b in args.backend:
+        if b not in BACKENDS:
+            ap.error(f"unknown backend {b!r}")
+    pygame.init()
+    screen = pygame.display.set_mode((app.WIDTH, app.HEIGHT))
+    try:
+        results = [run_config({"backend": b, "explosions": e, "every": args.every, "frames": args.frames,
+                               "warmup": args.warmup, "seed": args.seed}, screen)
+                   for b, e in itertools.product(args.backend, args.explosions)]
+    finally:
+        pygame.quit()
+
+    report = {
+        "benchmark": "fachade_fx",
+        "python": platform.python_version(),
+        "pygame": pygame.version.ver,
+        "numpy": np.__version__,
+        "results": results,
+    }
+    text = json.dumps(report, indent=2)
+    if args.out:
+        with open(args.out, "w") as f:
+            f.write(text + "\n")
+    else:
+        print(text)
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,15 +1,34 @@
 import pygame
+import json
+import os
 import random
+import sys
+from concurrent.futures.process import BrokenProcessPool
 from dataclasses import dataclass
-from typing import Dict, Tuple
+from itertools import islice
+from typing import Dict, List, Tuple
+
+# structural_patterns/ on the path for the helpers shared by all demos (common/)
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from common.frame_profiler import frame_profiler
+from common.text_cache import render_text
+
+try:
+    import numpy as np  # optional: enables the ParticleBuffer (structure-of-arrays) backend
+except ImportError:
+    np = None
 
 # =========================
 # Config
 # =========================
 WIDTH, HEIGHT = 1000, 600
+WORLD_W, WORLD_H = WIDTH, HEIGHT  # particles wrap here; see configure_world()
 BG = (18, 20, 24)
 HUD = (215, 215, 215)
 FPS = 60
+ALPHA_LEVELS = 32  # quantized alpha variants pre-baked per flyweight (2..256)
+TWINKLE = 10       # max alpha change per particle per frame
+ALPHA_MIN, ALPHA_MAX = 90, 255
 
 # =========================
 # Flyweight: intrinsic, shared state
@@ -21,11 +40,13 @@ class ParticleFlyweight:
       - size: int
       - color: (r,g,b)
       - pre-rendered Surface for fast blits
+      - lazily baked alpha variants, quantized to `alpha_levels` steps
     """
-    def __init__(self, shape: str, size: int, color: Tuple[int,int,int]):
+    def __init__(self, shape: str, size: int, color: Tuple[int,int,int], alpha_levels: int = ALPHA_LEVELS):
         self.shape = shape
         self.size = size
         self.color = color
+        self.alpha_levels = max(2, min(256, alpha_levels))
 
         # Pre-render a small sprite surface (with alpha) we can blit many times
         s = size * 2  # draw centered, so make room
@@ -37,14 +58,161 @@ class ParticleFlyweight:
         self.sprite = surf
         self.offset = (s//2, s//2)  # to draw centered
 
+        # alpha variants: index = quantized level, top level is the sprite itself
+        self._alpha_sprites: list[pygame.Surface | None] = [None] * self.alpha_levels
+        self._alpha_sprites[-1] = surf
+
+        # atlas mode: area-blits from one shared surface (see SpriteAtlas)
+        self.atlas: pygame.Surface | None = None
+        self.atlas_rects: List[pygame.Rect] = []
+
+    def attach_atlas(self, atlas: pygame.Surface, rects: List[pygame.Rect]):
+        """Draw from `atlas` (one rect per alpha level); variants become views into it."""
+        self.atlas = atlas
+        self.atlas_rects = rects
+        self._alpha_sprites = [atlas.subsurface(r) for r in rects]
+        self.sprite = self._alpha_sprites[-1]
+
+    def detach_atlas(self):
+        """Back to owned surfaces: copy the opaque sprite out of the atlas, re-bake variants lazily."""
+        if self.atlas is None:
+            return
+        self.sprite = self.sprite.copy()  # a subsurface would keep the dropped atlas alive
+        self._alpha_sprites = [None] * self.alpha_levels
+        self._alpha_sprites[-1] = self.sprite
+        self.atlas = None
+        self.atlas_rects = []
+
+    def alpha_level(self, alpha: int) -> int:
+        """Nearest quantized level for alpha in [0, 255]."""
+        a = max(0, min(255, alpha))
+        return (a * (self.alpha_levels - 1) + 127) // 255
+
+    def sprite_at_level(self, level: int) -> pygame.Surface:
+        temp = self._alpha_sprites[level]
+        if temp is None:
+            # baked once per (flyweight, level); every later draw reuses it
+            temp = self.sprite.copy()
+            alpha = level * 255 // (self.alpha_levels - 1)
+            temp.fill((255, 255, 255, alpha), special_flags=pygame.BLEND_RGBA_MULT)
+            self._alpha_sprites[level] = temp
+        return temp
+
+    def sprite_for(self, alpha: int) -> pygame.Surface:
+        """Sprite to blit for a given alpha (the shared sprite itself when opaque)."""
+        if alpha >= 255:
+            return self.sprite
+        return self.sprite_at_level(self.alpha_level(alpha))
+
+    def baked_levels(self) -> int:
+        return sum(1 for t in self._alpha_sprites if t is not None)
+
     def draw(self, screen: pygame.Surface, x: float, y: float, alpha: int = 255):
         """Blit centered. Optionally modulate alpha without reallocating the sprite."""
-        if alpha >= 255:
-            screen.blit(self.sprite, (int(x - self.offset[0]), int(y - self.offset[1])))
+        pos = (int(x - self.offset[0]), int(y - self.offset[1]))
+        if self.atlas is not None:
+            screen.blit(self.atlas, pos, self.atlas_rects[self.alpha_level(alpha)])
         else:
-            temp = self.sprite.copy()
-            temp.fill((255, 255, 255, alpha), special_flags=pygame.BLEND_RGBA_MULT)
-            screen.blit(temp, (int(x - self.offset[0]), int(y - self.offset[1])))
+            screen.blit(self.sprite_for(alpha), pos)
+
+    def draw_batch(self, screen: pygame.Surface, xs, ys, alphas):
+        """
+        Blit many particles sharing this flyweight with a single Surface.blits call.
+        xs/ys are centers (lists or NumPy arrays), alphas one value per particle.
+        """
+        ox, oy = self.offset
+        n = self.alpha_levels - 1
+        if np is not None and isinstance(xs, np.ndarray):
+            xs = (xs - ox).astype(np.int32).tolist()
+            ys = (ys - oy).astype(np.int32).tolist()
+            levels = ((np.clip(alphas, 0, 255).astype(np.int32) * n + 127) // 255).tolist()
+        else:
+            xs = [int(x - ox) for x in xs]
+            ys = [int(y - oy) for y in ys]
+            levels = [(max(0, min(255, a)) * n + 127) // 255 for a in alphas]
+        if self.atlas is not None:
+            atlas, rects = self.atlas, self.atlas_rects
+            screen.blits([(atlas, (x, y), rects[lv]) for x, y, lv in zip(xs, ys, levels)], doreturn=False)
+            return
+        sprites = self._alpha_sprites
+        for lv in set(levels):
+            if sprites[lv] is None:
+                self.sprite_at_level(lv)
+        screen.blits([(sprites[lv], (x, y)) for x, y, lv in zip(xs, ys, levels)], doreturn=False)
+
+# =========================
+# Sprite atlas: every flyweight and alpha variant in one surface
+# =========================
+class SpriteAtlas:
+    """
+    Shelf-packed surface holding every alpha level of every flyweight, plus the
+    rect table (rects[fw_id][level]). Can be saved as PNG + JSON sidecar and
+    loaded back, which skips baking the alpha variants at startup.
+    """
+    VERSION = 1
+    PAD = 1
+
+    def __init__(self, surface: pygame.Surface, rects: List[List[pygame.Rect]]):
+        self.surface = surface
+        self.rects = rects
+
+    @classmethod
+    def pack(cls, flyweights: List[ParticleFlyweight], max_width: int = 1024) -> "SpriteAtlas":
+        # one tile per (flyweight, level); tallest first keeps shelves tight
+        order = sorted(range(len(flyweights)), key=lambda i: -flyweights[i].sprite.get_height())
+        pad = cls.PAD
+        places: Dict[Tuple[int, int], Tuple[int, int]] = {}
+        x = y = shelf_h = width = 0
+        for i in order:
+            w, h = flyweights[i].sprite.get_size()
+            for lv in range(flyweights[i].alpha_levels):
+                if x + w + pad > max_width and x > 0:
+                    x, y, shelf_h = 0, y + shelf_h, 0
+                places[(i, lv)] = (x + pad, y + pad)
+                x += w + pad
+                shelf_h = max(shelf_h, h + pad)
+                width = max(width, x + pad)
+        height = y + shelf_h + pad
+
+        surface = pygame.Surface((max(1, width), max(1, height)), pygame.SRCALPHA)
+        surface.fill((0, 0, 0, 0))
+        rects = []
+        for i, fw in enumerate(flyweights):
+            size = fw.sprite.get_size()
+            row = []
+            for lv in range(fw.alpha_levels):
+                r = pygame.Rect(places[(i, lv)], size)
+                # MAX onto a cleared surface copies RGBA exactly (no blending)
+                surface.blit(fw.sprite_at_level(lv), r, special_flags=pygame.BLEND_RGBA_MAX)
+                row.append(r)
+            rects.append(row)
+        return cls(_fast_alpha(surface), rects)
+
+    def save(self, path: str, flyweights: List[ParticleFlyweight]):
+        """Writes <path>.png and <path>.json (keys + rect table)."""
+        pygame.image.save(self.surface, path + ".png")
+        meta = {
+            "version": self.VERSION,
+            "entries": [{"shape": fw.shape, "size": fw.size, "color": list(fw.color),
+                         "alpha_levels": fw.alpha_levels, "rects": [list(r) for r in row]}
+                        for fw, row in zip(flyweights, self.rects)],
+        }
+        with open(path + ".json", "w") as f:
+            json.dump(meta, f)
+
+    @classmethod
+    def load(cls, path: str) -> Tuple["SpriteAtlas", List[dict]]:
+        with open(path + ".json") as f:
+            meta = json.load(f)
+        if meta.get("version") != cls.VERSION:
+            raise ValueError(f"atlas version {meta.get('version')} != {cls.VERSION}")
+        surface = _fast_alpha(pygame.image.load(path + ".png"))
+        rects = [[pygame.Rect(r) for r in e["rects"]] for e in meta["entries"]]
+        return cls(surface, rects), meta["entries"]
+
+def _fast_alpha(surface: pygame.Surface) -> pygame.Surface:
+    """convert_alpha() once a display exists (faster blits); as-is when headless/uninitialised."""
+    return surface.convert_alpha() if pygame.display.get_surface() is not None else surface
 
 # =========================
 # Flyweight Factory
@@ -52,42 +220,104 @@ class ParticleFlyweight:
 class ParticleFlyweightFactory:
     """
     Caches flyweights by (shape, size, color) key.
+    Each flyweight also gets a small integer id (its index in `table`), so hot loops
+    can reach it with a list index instead of building and hashing the key.
+    `alpha_levels` bounds how many translucent variants each flyweight may bake.
     """
-    def __init__(self):
-        self._pool: Dict[Tuple[str, int, Tuple[int,int,int]], ParticleFlyweight] = {}
+    def __init__(self, alpha_levels: int = ALPHA_LEVELS):
+        self.alpha_levels = alpha_levels
+        self._ids: Dict[Tuple[str, int, Tuple[int,int,int]], int] = {}
+        self.table: List[ParticleFlyweight] = []
+        self._half = None  # cached half_extents() array
+        self.atlas: SpriteAtlas | None = None  # atlas mode when set
 
-    def get(self, shape: str, size: int, color: Tuple[int,int,int]) -> ParticleFlyweight:
+    def intern(self, shape: str, size: int, color: Tuple[int,int,int]) -> int:
+        """Id of the flyweight for this key, creating it on first use."""
         key = (shape, size, color)
-        fw = self._pool.get(key)
-        if fw is None:
-            fw = ParticleFlyweight(shape, size, color)
-            self._pool[key] = fw
-        return fw
+        fw_id = self._ids.get(key)
+        if fw_id is None:
+            fw_id = len(self.table)
+            self.table.append(ParticleFlyweight(shape, size, color, self.alpha_levels))
+            self._ids[key] = fw_id
+            if self.atlas is not None:
+                self.build_atlas()  # new flyweight: repack so it draws from the atlas too
+        return fw_id
+
+    # ---- atlas mode ----
+    def build_atlas(self, max_width: int = 1024) -> SpriteAtlas:
+        """Pack every flyweight (all alpha levels) into one surface and draw from it."""
+        self.atlas = SpriteAtlas.pack(self.table, max_width)
+        for fw, rects in zip(self.table, self.atlas.rects):
+            fw.attach_atlas(self.atlas.surface, rects)
+        return self.atlas
+
+    def drop_atlas(self):
+        self.atlas = None
+        for fw in self.table:
+            fw.detach_atlas()
+
+    def save_atlas(self, path: str):
+        (self.atlas or self.build_atlas()).save(path, self.table)
+
+    def load_atlas(self, path: str) -> bool:
+        """
+        Restore flyweights + alpha variants from a saved atlas (fast startup).
+        Returns False if missing or built with a different alpha quantization.
+        """
+        try:
+            atlas, entries = SpriteAtlas.load(path)
+        except (OSError, ValueError, KeyError, pygame.error):
+            return False
+        if any(e["alpha_levels"] != self.alpha_levels for e in entries):
+            return False
+        self.atlas = None  # no repacking while we intern the saved keys
+        for e, rects in zip(entries, atlas.rects):
+            fw = self.table[self.intern(e["shape"], e["size"], tuple(e["color"]))]
+            fw.attach_atlas(atlas.surface, rects)
+        self.atlas = atlas
+        if any(fw.atlas is None for fw in self.table):
+            self.build_atlas()  # flyweights the file didn't know about
+        return True
+
+    def get(self, shape: str, size: int, color: Tuple[int,int,int]) -> ParticleFlyweight:
+        return self.table[self.intern(shape, size, color)]
 
     def count(self) -> int:
-        return len(self._pool)
+        return len(self.table)
+
+    def sprite_count(self) -> int:
+        """Surfaces owned by the cache, alpha variants included."""
+        return sum(fw.baked_levels() for fw in self.table)
+
+    def half_extents(self):
+        """(count, 2) int array of sprite half sizes by flyweight id, for vectorized culling."""
+        if self._half is None or len(self._half) != len(self.table):
+            self._half = np.array([fw.offset for fw in self.table], dtype=np.int32).reshape(-1, 2)
+        return self._half
 
 # =========================
 # Particle: extrinsic state only
 # =========================
-@dataclass
+@dataclass(slots=True)
 class Particle:
     x: float
     y: float
     vx: float
     vy: float
     alpha: int
-    fw_key: Tuple[str, int, Tuple[int,int,int]]  # reference key to shared flyweight
+    style: int  # id of the shared flyweight (index into ParticleFlyweightFactory.table)
 
-    def update(self, dt: float):
-        self.x = (self.x + self.vx * dt) % WIDTH
-        self.y = (self.y + self.vy * dt) % HEIGHT
+    def update(self, dt: float, dalpha: int = None):
+        """dalpha: pre-drawn twinkle delta (see twinkle_deltas); drawn here when None."""
+        self.x = (self.x + self.vx * dt) % WORLD_W
+        self.y = (self.y + self.vy * dt) % WORLD_H
         # optional twinkle
-        self.alpha = max(90, min(255, self.alpha + random.randint(-10, 10)))
+        if dalpha is None:
+            dalpha = random.randint(-TWINKLE, TWINKLE)
+        self.alpha = max(ALPHA_MIN, min(ALPHA_MAX, self.alpha + dalpha))
 
     def draw(self, screen: pygame.Surface, factory: ParticleFlyweightFactory):
-        shape, size, color = self.fw_key
-        fw = factory.get(shape, size, color)
+        fw = factory.table[self.style]
         fw.draw(screen, self.x, self.y, alpha=self.alpha)
 
 # =========================
@@ -101,101 +331,485 @@ STYLES = [
     ("circle", 8,  (221, 160, 221)),  # plum large
 ]
 
-def random_particle() -> Particle:
+def random_particle_fields(factory: ParticleFlyweightFactory) -> tuple:
+    """(x, y, vx, vy, alpha, style) for one particle of a random style."""
     shape, size, color = random.choice(STYLES)
     speed = random.uniform(30, 180)
     angle = random.uniform(0, 6.28318)
     vx = speed * 0.8 * (1 if random.random() < 0.5 else -1) * random.random()
     vy = speed * 0.8 * (1 if random.random() < 0.5 else -1) * random.random()
-    return Particle(
-        x=random.uniform(0, WIDTH),
-        y=random.uniform(0, HEIGHT),
-        vx=vx, vy=vy,
-        alpha=random.randint(120, 255),
-        fw_key=(shape, size, color)
-    )
-
-def batch_add(particles, n: int, preset_idx: int = None):
+    return (random.uniform(0, WORLD_W), random.uniform(0, WORLD_H), vx, vy,
+            random.randint(120, 255), factory.intern(shape, size, color))
+
+def random_particle(factory: ParticleFlyweightFactory) -> Particle:
+    return Particle(*random_particle_fields(factory))
+
+def preset_particle_fields(factory: ParticleFlyweightFactory, preset_idx: int) -> tuple:
+    """(x, y, vx, vy, alpha, style) for one particle of a preset style."""
+    shape, size, color = STYLES[preset_idx % len(STYLES)]
+    speed = random.uniform(40, 160)
+    vx = random.uniform(-speed, speed)
+    vy = random.uniform(-speed, speed)
+    return (random.uniform(0, WORLD_W), random.uniform(0, WORLD_H), vx, vy,
+            random.randint(130, 255), factory.intern(shape, size, color))
+
+def batch_add(particles, factory: ParticleFlyweightFactory, n: int, preset_idx: int = None):
+    if isinstance(particles, ParticleBuffer):
+        particles.batch_add(factory, n, preset_idx)
+        return
+    pooled = isinstance(particles, ParticlePool)
     for _ in range(n):
         if preset_idx is None:
-            p = random_particle()
+            fields = random_particle_fields(factory)
+        else:
+            fields = preset_particle_fields(factory, preset_idx)
+        if pooled:
+            particles.spawn(*fields)  # reuses a released Particle when one is free
+        else:
+            particles.append(Particle(*fields))
+
+# =========================
+# Object pool for the dataclass backend
+# =========================
+class ParticlePool:
+    """
+    Recycles Particle objects across spawn/clear cycles instead of allocating new ones.
+      - slots[:live] are alive, slots[live:] is the free list (released objects)
+      - release() swap-removes, clear() just resets `live`
+    Iterates/len()s like the list it replaces.
+    """
+    def __init__(self):
+        self.slots: List[Particle] = []
+        self.live = 0
+        self.high_water = 0
+
+    def __len__(self) -> int:
+        return self.live
+
+    def __iter__(self):
+        return islice(self.slots, self.live)
+
+    def spawn(self, x: float, y: float, vx: float, vy: float, alpha: int, style: int) -> Particle:
+        if self.live < len(self.slots):
+            p = self.slots[self.live]
+            p.x, p.y, p.vx, p.vy, p.alpha, p.style = x, y, vx, vy, alpha, style
+        else:
+            p = Particle(x, y, vx, vy, alpha, style)
+            self.slots.append(p)
+        self.live += 1
+        self.high_water = max(self.high_water, self.live)
+        return p
+
+    def release(self, i: int):
+        """Free live slot i: the last live particle moves into it, i's object joins the free list."""
+        last = self.live - 1
+        self.slots[i], self.slots[last] = self.slots[last], self.slots[i]
+        self.live = last
+
+    def clear(self):
+        self.live = 0
+
+    def stats(self) -> Dict[str, int]:
+        return {"capacity": len(self.slots), "live": self.live, "high_water": self.high_water,
+                "free": len(self.slots) - self.live}
+
+# =========================
+# Structure-of-arrays backend (NumPy)
+# =========================
+def twinkle_deltas(rng, n: int):
+    """All alpha deltas for one frame in a single RNG call: uniform ints in [-TWINKLE, TWINKLE]."""
+    return rng.integers(-TWINKLE, TWINKLE + 1, size=n, dtype=np.int16)
+
+def twinkle(alpha, rng):
+    """
+    Batched twin of Particle.update's twinkle, in place on an int16 alpha array:
+    same delta distribution, same clamp to [ALPHA_MIN, ALPHA_MAX].
+    """
+    alpha += twinkle_deltas(rng, alpha.shape[0])
+    np.clip(alpha, ALPHA_MIN, ALPHA_MAX, out=alpha)
+
+def integrate(x, y, vx, vy, alpha, dt: float, rng, world: Tuple[float, float] = None):
+    """
+    One simulation step, in place, on matching array slices (whole buffer or one worker's shard).
+    rng=None skips the twinkle; world defaults to (WORLD_W, WORLD_H).
+    """
+    world_w, world_h = world or (WORLD_W, WORLD_H)
+    x += vx * dt
+    y += vy * dt
+    np.mod(x, world_w, out=x)
+    np.mod(y, world_h, out=y)
+    # optional twinkle (same clamp as Particle.update)
+    if rng is not None:
+        twinkle(alpha, rng)
+
+class ParticleBuffer:
+    """
+    Same extrinsic state as Particle, but stored column-wise in NumPy arrays:
+      - x, y, vx, vy: float32
+      - alpha: int16 (room for the twinkle delta before clamping)
+      - style: flyweight id (index into ParticleFlyweightFactory.table)
+      - alive: slot in use
+    Update is a handful of vectorized ops instead of one Python call per particle.
+    All randomness (spawn + twinkle) comes from one seedable numpy Generator.
+
+    It is also a capacity-based pool: slots [0, count) have been handed out, `alive`
+    marks which of them are in use and freed slots go on a free-list that spawning
+    drains first. clear() frees everything without releasing memory.
+    """
+    FIELDS = (("x", "float32"), ("y", "float32"), ("vx", "float32"), ("vy", "float32"),
+              ("alpha", "int16"), ("style", "int16"), ("alive", "bool"))
+
+    def __init__(self, capacity: int = 4096, seed: int = None):
+        if np is None:
+            raise RuntimeError("ParticleBuffer requires numpy (pip install numpy)")
+        self.rng = np.random.default_rng(seed)
+        self.world = (WORLD_W, WORLD_H)
+        self.count = 0       # slots handed out (dead ones included)
+        self.live = 0
+        self.high_water = 0  # most particles alive at once
+        self.capacity = 0
+        self.x = self.y = self.vx = self.vy = self.alpha = self.style = self.alive = None
+        self._free = np.zeros(0, dtype=np.int32)  # free-list stack of slot indices
+        self._nfree = 0
+        self._grow(capacity)
+
+    def __len__(self) -> int:
+        return self.live
+
+    def _grow(self, min_capacity: int):
+        cap = max(min_capacity, self.capacity * 2, 16)
+        for name, dtype in self.FIELDS:
+            arr = self._new_array(name, cap, dtype)
+            old = getattr(self, name)
+            if old is not None:
+                arr[:self.count] = old[:self.count]
+            setattr(self, name, arr)
+        free = np.zeros(cap, dtype=np.int32)
+        free[:self._nfree] = self._free[:self._nfree]
+        self._free = free
+        self.capacity = cap
+
+    def _take_slots(self, n: int):
+        """n slot indices: free-list first, then fresh slots past `count` (growing if needed)."""
+        reuse = min(n, self._nfree)
+        taken = self._free[self._nfree - reuse:self._nfree].copy()
+        self._nfree -= reuse
+        fresh = n - reuse
+        if fresh:
+            if self.count + fresh > self.capacity:
+                self._grow(self.count + fresh)
+            taken = np.concatenate((taken, np.arange(self.count, self.count + fresh, dtype=np.int32)))
+            self.count += fresh
+        return taken
+
+    def _new_array(self, name: str, capacity: int, dtype: str):
+        """Storage hook for one column (SharedParticleBuffer puts it in shared memory)."""
+        return np.zeros(capacity, dtype=dtype)
+
+    def batch_add(self, factory: ParticleFlyweightFactory, n: int, preset_idx: int = None):
+        """Vectorized twin of the module-level batch_add (same distributions)."""
+        if n <= 0:
+            return
+        style_ids = np.array([factory.intern(*st) for st in STYLES], dtype=np.int16)
+        sl = self._take_slots(n)
+
+        rng = self.rng
+        if preset_idx is None:
+            style = style_ids[rng.integers(0, len(STYLES), size=n)]
+            speed = rng.uniform(30, 180, size=n)
+            sign_x = np.where(rng.random(n) < 0.5, 1.0, -1.0)
+            sign_y = np.where(rng.random(n) < 0.5, 1.0, -1.0)
+            vx = speed * 0.8 * sign_x * rng.random(n)
+            vy = speed * 0.8 * sign_y * rng.random(n)
+            alpha = rng.integers(120, 256, size=n)
         else:
-            shape, size, color = STYLES[preset_idx % len(STYLES)]
-            speed = random.uniform(40, 160)
-            vx = random.uniform(-speed, speed)
-            vy = random.uniform(-speed, speed)
-            p = Particle(
-                x=random.uniform(0, WIDTH),
-                y=random.uniform(0, HEIGHT),
-                vx=vx, vy=vy,
-                alpha=random.randint(130, 255),
-                fw_key=(shape, size, color)
-            )
-        particles.append(p)
-
-def draw_hud(screen, factory: ParticleFlyweightFactory, particles_count: int, fps_now: float):
-    font = pygame.font.SysFont("consolas", 18)
+            style = np.full(n, style_ids[preset_idx % len(STYLES)])
+            speed = rng.uniform(40, 160, size=n)
+            vx = rng.uniform(-speed, speed)
+            vy = rng.uniform(-speed, speed)
+            alpha = rng.integers(130, 256, size=n)
+
+        self.x[sl] = rng.uniform(0, self.world[0], size=n)
+        self.y[sl] = rng.uniform(0, self.world[1], size=n)
+        self.vx[sl] = vx
+        self.vy[sl] = vy
+        self.alpha[sl] = alpha
+        self.style[sl] = style
+        self.alive[sl] = True
+        self.live += n
+        self.high_water = max(self.high_water, self.live)
+
+    def kill(self, slots):
+        """Free the given slots (ignores ones already dead) and push them on the free-list."""
+        slots = np.unique(np.asarray(slots, dtype=np.int32))
+        slots = slots[self.alive[slots]]
+        self.alive[slots] = False
+        self._free[self._nfree:self._nfree + len(slots)] = slots
+        self._nfree += len(slots)
+        self.live -= len(slots)
+
+    def clear(self):
+        # every slot is free again; rewinding `count` makes the next spawns refill from slot 0
+        self.alive[:self.count] = False
+        self.count = 0
+        self._nfree = 0
+        self.live = 0
+
+    def stats(self) -> Dict[str, int]:
+        return {"capacity": self.capacity, "live": self.live, "high_water": self.high_water,
+                "free": self.capacity - self.live}
+
+    def update(self, dt: float, twinkle: bool = True):
+        n = self.count
+        integrate(self.x[:n], self.y[:n], self.vx[:n], self.vy[:n], self.alpha[:n], dt,
+                  self.rng if twinkle else None, self.world)
+
+    def draw(self, screen: pygame.Surface, factory: ParticleFlyweightFactory, view: "Viewport" = None) -> int:
+        """
+        One Surface.blits per style: the grouping is a NumPy mask, not a Python loop.
+        With a viewport, off-screen particles are culled first (vectorized), so the
+        blit work scales with what is visible. Returns the number of particles drawn.
+        """
+        n = self.count
+        x, y, alpha, style = self.x[:n], self.y[:n], self.alpha[:n], self.style[:n]
+        table = factory.table
+        if self.live < n:  # skip freed slots (dead particles still integrate, they just aren't drawn)
+            idx = np.flatnonzero(self.alive[:n])
+            x, y, alpha, style = x[idx], y[idx], alpha[idx], style[idx]
+        if view is not None:
+            half = factory.half_extents()
+            idx = np.flatnonzero(view.visible_mask(x, y, half[style, 0], half[style, 1]))
+            x, y, alpha, style = x[idx] - view.x, y[idx] - view.y, alpha[idx], style[idx]
+        for s in np.flatnonzero(np.bincount(style, minlength=len(table))).tolist():
+            mask = style == s
+            table[s].draw_batch(screen, x[mask], y[mask], alpha[mask])
+        return len(style)
+
+# =========================
+# Viewport (camera) + culling
+# =========================
+class Viewport:
+    """
+    Window-sized camera onto the wrapped world. A sprite is visible when its
+    box (center ± half extent) overlaps the viewport rectangle.
+    """
+    def __init__(self, w: int, h: int, x: float = 0.0, y: float = 0.0):
+        self.w, self.h = w, h
+        self.x, self.y = x, y
+
+    def pan(self, dx: float, dy: float):
+        self.x = max(0.0, min(WORLD_W - self.w, self.x + dx))
+        self.y = max(0.0, min(WORLD_H - self.h, self.y + dy))
+
+    def visible_mask(self, xs, ys, half_w, half_h):
+        """Vectorized visibility test (NumPy arrays in, boolean mask out)."""
+        return ((xs + half_w > self.x) & (xs - half_w < self.x + self.w) &
+                (ys + half_h > self.y) & (ys - half_h < self.y + self.h))
+
+    def sees(self, x: float, y: float, half_w: int, half_h: int) -> bool:
+        return (x + half_w > self.x and x - half_w < self.x + self.w and
+                y + half_h > self.y and y - half_h < self.y + self.h)
+
+def configure_world(scale: float = 1.0):
+    """World = scale x window. Call before spawning; particles wrap at the new size."""
+    global WORLD_W, WORLD_H
+    WORLD_W, WORLD_H = int(WIDTH * max(1.0, scale)), int(HEIGHT * max(1.0, scale))
+
+BACKENDS = ("dataclass", "numpy")
+
+def make_particles(backend: str, seed: int = None, workers: int = 0):
+    """
+    Empty particle store for the chosen backend: list of Particle, ParticleBuffer, or
+    (backend "shared") a SharedParticleBuffer integrated by `workers` processes.
+    """
+    if backend == "shared":
+        from particle_workers import SharedParticleBuffer  # multiprocessing mode is opt-in
+        return SharedParticleBuffer(workers=max(1, workers), seed=seed)
+    return ParticleBuffer(seed=seed) if backend == "numpy" else ParticlePool()
+
+def kill_random(particles, n: int):
+    """Free up to n random live particles (exercises the pools' free-lists)."""
+    if isinstance(particles, ParticleBuffer):
+        live = np.flatnonzero(particles.alive[:particles.count])
+        if len(live):
+            particles.kill(particles.rng.choice(live, size=min(n, len(live)), replace=False))
+    else:
+        for _ in range(min(n, len(particles))):
+            particles.release(random.randrange(len(particles)))
+
+def update_particles(particles, dt: float, rng=None, twinkle: bool = True):
+    """rng: optional numpy Generator; the dataclass path then draws its twinkle deltas in one call."""
+    if isinstance(particles, ParticleBuffer):
+        particles.update(dt, twinkle)
+    elif not twinkle:
+        for p in particles:
+            p.update(dt, 0)
+    elif rng is not None:
+        for p, d in zip(particles, twinkle_deltas(rng, len(particles)).tolist()):
+            p.update(dt, d)
+    else:
+        for p in particles:
+            p.update(dt)
+
+def draw_particles(screen: pygame.Surface, particles, factory: ParticleFlyweightFactory,
+                   batched: bool = True, view: Viewport = None) -> int:
+    """
+    batched=True groups particles by flyweight key and submits each group with one
+    Surface.blits call; batched=False keeps the classic one-blit-per-Particle path.
+    view: optional Viewport; particles outside it are skipped (world -> screen coords).
+    Returns the number of particles drawn.
+    """
+    if isinstance(particles, ParticleBuffer):
+        return particles.draw(screen, factory, view)
+    vx, vy = (view.x, view.y) if view is not None else (0, 0)
+    drawn = 0
+    if batched:
+        # groups indexed by flyweight id: plain list indexing, no key hashing per particle
+        groups = [([], [], []) for _ in factory.table]
+        offsets = [fw.offset for fw in factory.table]
+        for p in particles:
+            if view is not None and not view.sees(p.x, p.y, *offsets[p.style]):
+                continue
+            g = groups[p.style]
+            g[0].append(p.x - vx); g[1].append(p.y - vy); g[2].append(p.alpha)
+        for fw, (xs, ys, alphas) in zip(factory.table, groups):
+            if xs:
+                fw.draw_batch(screen, xs, ys, alphas)
+                drawn += len(xs)
+    else:
+        for p in particles:
+            fw = factory.table[p.style]
+            if view is not None and not view.sees(p.x, p.y, *fw.offset):
+                continue
+            fw.draw(screen, p.x - vx, p.y - vy, alpha=p.alpha)
+            drawn += 1
+    return drawn
+
+def draw_hud(screen, factory: ParticleFlyweightFactory, particles_count: int, fps_now: float, backend: str,
+             visible: int, view: Viewport, pool: Dict[str, int]):
     lines = [
         "Flyweight Pattern demo — many particles sharing intrinsic state (shape/size/color sprite)",
-        f"Particles: {particles_count:,}    Flyweights in cache: {factory.count()}    FPS: {fps_now:5.1f}",
-        "SPACE: +1000 random  |  1/2/3: +250 of preset types  |  C: clear  |  ESC: quit",
+        f"Particles: {particles_count:,}    Flyweights in cache: {factory.count()} ({factory.sprite_count()} sprites)    FPS: {fps_now:5.1f}    Backend: {backend}",
+        f"Visible: {visible:,}    World: {WORLD_W}x{WORLD_H}    Camera: ({int(view.x)}, {int(view.y)})    Atlas: {'ON' if factory.atlas else 'OFF'}",
+        f"Pool: capacity {pool['capacity']:,}    live {pool['live']:,}    high-water {pool['high_water']:,}    free-list {pool['free']:,}",
+        "SPACE: +1000 random  |  1/2/3: +250 of preset types  |  X: free 1000  |  C: clear  |  B: switch backend  |  A: atlas  |  Arrows: pan  |  ESC: quit",
         "Flyweight = shared sprite per (shape,size,color). Particles only keep position/velocity (extrinsic)."
     ]
     y = 10
     for i, t in enumerate(lines):
         color = HUD if i == 0 else (200, 200, 200)
-        screen.blit(font.render(t, True, color), (10, y))
+        screen.blit(render_text(t, color), (10, y))
         y += 20
 
 # =========================
 # Main
 # =========================
-def main():
+def main(backend: str = "dataclass", seed: int = None, workers: int = 0, world_scale: float = 1.0,
+         atlas_path: str = None):
+    configure_world(world_scale)
     pygame.init()
     screen = pygame.display.set_mode((WIDTH, HEIGHT))
     pygame.display.set_caption("Flyweight Pattern with pygame — shared particle sprites")
     clock = pygame.time.Clock()
+    view = Viewport(WIDTH, HEIGHT)
 
     factory = ParticleFlyweightFactory()
-    particles: list[Particle] = []
+    if atlas_path:
+        # warm start from disk; otherwise build from STYLES and save for next time
+        if factory.load_atlas(atlas_path):
+            print(f"[flyweight] atlas loaded from {atlas_path}.png")
+        else:
+            for style in STYLES:
+                factory.intern(*style)
+            factory.save_atlas(atlas_path)
+            print(f"[flyweight] atlas built and saved to {atlas_path}.png")
+    particles = make_particles(backend, seed, workers)  # list[Particle] or ParticleBuffer
+    backends = BACKENDS + (("shared",) if workers > 0 or backend == "shared" else ())
+    rng = np.random.default_rng(seed) if np is not None else None
 
     # start with a few thousand to show performance
-    batch_add(particles, 2000)
+    batch_add(particles, factory, 2000)
 
+    prof = frame_profiler("flyweight")  # opt-in: FRAME_PROFILE=1
     running = True
-    while running:
-        dt = clock.tick(FPS) / 1000.0
-
-        for e in pygame.event.get():
-            if e.type == pygame.QUIT:
-                running = False
-            elif e.type == pygame.KEYDOWN:
-                if e.key == pygame.K_ESCAPE:
+    try:
+        while running:
+            dt = clock.tick(FPS) / 1000.0
+            prof.begin_frame()
+
+            for e in pygame.event.get():
+                if e.type == pygame.QUIT:
                     running = False
-                elif e.key == pygame.K_SPACE:
-                    batch_add(particles, 1000)
-                elif e.key == pygame.K_1:
-                    batch_add(particles, 250, preset_idx=0)  # skyblue small circles
-                elif e.key == pygame.K_2:
-                    batch_add(particles, 250, preset_idx=2)  # tomato squares
-                elif e.key == pygame.K_3:
-                    batch_add(particles, 250, preset_idx=4)  # plum large circles
-                elif e.key == pygame.K_c:
-                    particles.clear()
-
-        # Update
-        for p in particles:
-            p.update(dt)
+                elif e.type == pygame.KEYDOWN:
+                    if e.key == pygame.K_ESCAPE:
+                        running = False
+                    elif e.key == pygame.K_SPACE:
+                        batch_add(particles, factory, 1000)
+                    elif e.key == pygame.K_1:
+                        batch_add(particles, factory, 250, preset_idx=0)  # skyblue small circles
+                    elif e.key == pygame.K_2:
+                        batch_add(particles, factory, 250, preset_idx=2)  # tomato squares
+                    elif e.key == pygame.K_3:
+                        batch_add(particles, factory, 250, preset_idx=4)  # plum large circles
+                    elif e.key == pygame.K_c:
+                        particles.clear()  # slots go back to the pool, nothing is deallocated
+                    elif e.key == pygame.K_x:
+                        kill_random(particles, 1000)
+                    elif e.key == pygame.K_a:
+                        if factory.atlas:
+                            factory.drop_atlas()
+                        else:
+                            factory.build_atlas()
+                    elif e.key == pygame.K_b and np is not None:
+                        # same particle count, other storage layout (side-by-side benchmark)
+                        backend = backends[(backends.index(backend) + 1) % len(backends)]
+                        n = len(particles)
+                        if hasattr(particles, "close"):
+                            particles.close()
+                        particles = make_particles(backend, seed, workers)
+                        batch_add(particles, factory, n)
 
-        # Render
-        screen.fill(BG)
-        for p in particles:
-            p.draw(screen, factory)
+            keys = pygame.key.get_pressed()
+            pan = 600 * dt
+            view.pan((keys[pygame.K_RIGHT] - keys[pygame.K_LEFT]) * pan,
+                     (keys[pygame.K_DOWN] - keys[pygame.K_UP]) * pan)
+            prof.mark("event")
+
+            # Update
+            update_particles(particles, dt, rng)
+            prof.mark("update")
 
-        draw_hud(screen, factory, len(particles), clock.get_fps())
-        pygame.display.flip()
+            # Render
+            screen.fill(BG)
+            visible = draw_particles(screen, particles, factory, view=view)
 
-    pygame.quit()
+            draw_hud(screen, factory, len(particles), clock.get_fps(), backend, visible, view, particles.stats())
+            prof.draw(screen, (WIDTH - 250, 110))
+            prof.mark("render")
+            pygame.display.flip()
+            prof.mark("flip")
+    except BrokenProcessPool:  # 'shared' backend: a worker was killed (e.g. SIGTERM to the group)
+        print("[flyweight] a worker process died; exiting")
+    finally:
+        prof.close()
+        if hasattr(particles, "close"):
+            particles.close()  # stop workers, release shared memory (also on Ctrl+C / errors)
+        pygame.quit()
 
 if __name__ == "__main__":
-    main()
+    import argparse
+    # particle_workers imports this file as "flyweight_app": make that the running module
+    sys.modules.setdefault("flyweight_app", sys.modules[__name__])
+    ap = argparse.ArgumentParser(description="Flyweight particle swarm demo")
+    ap.add_argument("--backend", choices=BACKENDS + ("shared",), default="dataclass")
+    ap.add_argument("--seed", type=int, default=None)
+    ap.add_argument("--workers", type=int, default=0,
+                    help="worker processes for the 'shared' backend (multiprocessing + shared_memory)")
+    ap.add_argument("--world-scale", type=float, default=1.0,
+                    help="world size as a multiple of the window (pan with the arrow keys)")
+    ap.add_argument("--atlas", metavar="PATH",
+                    help="start in atlas mode, loading PATH.png/.json if present (saved otherwise)")
+    args = ap.parse_args()
+    if args.backend == "shared" and args.workers <= 0:
+        args.workers = 2
+    main(args.backend, args.seed, args.workers, args.world_scale, args.atlas)
@@ -0,0 +1,215 @@
+"""
+Headless particle-throughput benchmark for the Flyweight demo.
+
+Spawns N particles through `batch_add`, then times update and draw separately
+for a fixed number of frames (SDL_VIDEODRIVER=dummy, no vsync/clock cap).
+Every configuration of the sweep runs in a fresh process, so peak RSS is per
+configuration (null where the `resource` module is unavailable). Results
+are printed (or written) as JSON.
+
+    python flyweight_bench.py --particles 1000,10000,50000 --styles 1,5 --alpha on,off
+    python flyweight_bench.py --out base.json
+    python flyweight_bench.py --compare base.json --max-regression 0.15   # exit 1 on regression
+"""
+import os
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+
+import argparse
+import itertools
+import json
+import multiprocessing as mp
+import platform
+import sys
+import time
+from typing import Dict, List, Optional
+
+try:
+    import resource  # POSIX only: peak RSS is reported as null elsewhere (e.g. Windows)
+except ImportError:
+    resource = None
+
+import numpy as np
+import pygame
+
+import flyweight_app as app
+
+def _percentiles(ns: List[int]) -> Dict[str, float]:
+    ms = np.asarray(ns, dtype=np.float64) / 1e6
+    p50, p95, p99 = np.percentile(ms, [50, 95, 99])
+    return {"mean": float(ms.mean()), "p50": float(p50), "p95": float(p95), "p99": float(p99)}
+
+def _peak_rss_mb() -> Optional[float]:
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is KiB on Linux, bytes on macOS
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+def run_config(cfg: dict) -> dict:
+    """One benchmark run; meant to execute in its own process."""
+    app.configure_world(cfg["world_scale"])
+    pygame.init()
+    screen = pygame.display.set_mode((app.WIDTH, app.HEIGHT))
+    view = app.Viewport(app.WIDTH, app.HEIGHT)
+    factory = app.ParticleFlyweightFactory()
+    if cfg["atlas"]:
+        for style in app.STYLES:
+            factory.intern(*style)
+        factory.build_atlas()
+    particles = app.make_particles(cfg["backend"], cfg["seed"], cfg["workers"])
+    rng = np.random.default_rng(cfg["seed"])
+    try:
+        # spread N over the first `styles` presets
+        n, styles = cfg["particles"], cfg["styles"]
+        for i in range(styles):
+            app.batch_add(particles, factory, n // styles + (1 if i < n % styles else 0), preset_idx=i)
+        if not cfg["alpha"]:
+            if isinstance(particles, app.ParticleBuffer):
+                particles.alpha[:particles.count] = 255
+            else:
+                for p in particles:
+                    p.alpha = 255
+
+        dt = 1.0 / app.FPS
+        update_ns, draw_ns, drawn = [], [], []
+        for frame in range(cfg["warmup"] + cfg["frames"]):
+            t0 = time.perf_counter_ns()
+            app.update_particles(particles, dt, rng, twinkle=cfg["alpha"])
+            t1 = time.perf_counter_ns()
+            screen.fill(app.BG)
+            visible = app.draw_particles(screen, particles, factory, view=view)
+            t2 = time.perf_counter_ns()
+            pygame.display.flip()
+            if frame >= cfg["warmup"]:
+                update_ns.append(t1 - t0)
+                draw_ns.append(t2 - t1)
+                drawn.append(visible)
+    finally:
+        if hasattr(particles, "close"):
+            particles.close()
+        pygame.quit()
+
+    frame_ns = [u + d for u, d in zip(update_ns, draw_ns)]
+    total_s = sum(frame_ns) / 1e9
+    return {
+        "config": cfg,
+        "particles_per_sec": n * len(frame_ns) / total_s if total_s else None,
+        "update_particles_per_sec": n * len(update_ns) / (sum(update_ns) / 1e9) if sum(update_ns) else None,
+        "update_ms": _percentiles(update_ns),
+        "draw_ms": _percentiles(draw_ns),
+        "frame_ms": _percentiles(frame_ns),
+        "visible_mean": float(np.mean(drawn)),
+        "peak_rss_mb": _peak_rss_mb(),
+    }
+
+def _child(cfg: dict, conn):
+    try:
+        conn.send(("ok", run_config(cfg)))
+    except BaseException as exc:  # report, don't hang the parent
+        conn.send(("error", f"{type(exc).__name__}: {exc}"))
+    finally:
+        conn.close()
+
+def run_isolated(cfg: dict) -> dict:
+    """
+    Run one configuration in a fresh, non-daemonic process (the shared backend
+    starts its own pool, which pool workers may not do). Keeps peak RSS per config.
+    """
+    ctx = mp.get_context("spawn")
+    parent, child = ctx.Pipe(duplex=False)
+    proc = ctx.Process(target=_child, args=(cfg, child))
+    proc.start()
+    child.close()
+    status, payload = parent.recv()
+    proc.join()
+    if status != "ok":
+        raise RuntimeError(f"benchmark {cfg} failed: {payload}")
+    return payload
+
+def _csv(kind):
+    return lambda s: [kind(v.strip()) for v in s.split(",") if v.strip()]
+
+def _on_off(v: str) -> bool:
+    if v not in ("on", "off"):
+        raise argparse.ArgumentTypeError("expected on/off")
+    return v == "on"
+
+def _key(cfg: dict) -> tuple:
+    return (cfg["backend"], cfg["workers"], cfg["particles"], cfg["styles"], cfg["alpha"],
+            cfg.get("world_scale", 1.0), cfg.get("atlas", False))
+
+def compare(results: List[dict], baseline: List[dict], max_regression: float) -> List[str]:
+    """Configurations whose p50 frame time got slower than baseline by more than max_regression."""
+    base = {_key(r["config"]): r for r in baseline}
+    failures = []
+    for r in results:
+        b = base.get(_key(r["config"]))
+        if b is None:
+            continue
+        now, then = r["frame_ms"]["p50"], b["frame_ms"]["p50"]
+        if then > 0 and (now - then) / then > max_regression:
+            failures.append(f"{_key(r['config'])}: p50 frame {then:.2f} ms -> {now:.2f} ms")
+    return failures
+
+def main(argv=None) -> int:
+    ap = argparse.ArgumentParser(description="Headless particle-throughput benchmark (Flyweight demo)")
+    ap.add_argument("--particles", type=_csv(int), default=[1_000, 10_000, 50_000], help="comma-separated N sweep")
+    ap.add_argument("--styles", type=_csv(int), default=[len(app.STYLES)], help="presets used, e.g. 1,5")
+    ap.add_argument("--alpha", type=_csv(_on_off), default=[True], help="twinkle/translucency: on,off")
+    ap.add_argument("--backend", type=_csv(str), default=["dataclass", "numpy"],
+                    help="dataclass,numpy,shared")
+    ap.add_argument("--world-scale", type=_csv(float), default=[1.0],
+                    help="world size as a multiple of the window (viewport culling), e.g. 1,4")
+    ap.add_argument("--atlas", type=_csv(_on_off), default=[False], help="sprite atlas mode: on,off")
+    ap.add_argument("--workers", type=int, default=2, help="worker processes for the shared backend")
+    ap.add_argument("--frames", type=int, default=120)
+    ap.add_argument("--warmup", type=int, default=10)
+    ap.add_argument("--seed", type=int, default=1234)
+    ap.add_argument("--out", help="write JSON here instead of stdout")
+    ap.add_argument("--compare", help="baseline JSON from a previous run")
+    ap.add_argument("--max-regression", type=float, default=0.15,
+                    help="allowed p50 frame-time slowdown vs baseline (fraction)")
+    args = ap.parse_args(argv)
+
+    for b in args.backend:
+        if b not in app.BACKENDS + ("shared",):
+            ap.error(f"unknown backend {b!r}")
+    configs = [
+        {"backend": b, "workers": args.workers if b == "shared" else 0, "particles": n,
+         "styles": max(1, min(s, len(app.STYLES))), "alpha": a, "world_scale": w,
+         "atlas": at, "frames": args.frames, "warmup": args.warmup, "seed": args.seed}
+        for b, n, s, a, w, at in itertools.product(args.backend, args.particles, args.styles, args.alpha,
+                                                   args.world_scale, args.atlas)
+    ]
+
+    # one fresh process per configuration: isolated peak RSS and sprite caches
+    results = [run_isolated(cfg) for cfg in configs]
+
+    report = {
+        "benchmark": "flyweight_particles",
+        "python": platform.python_version(),
+        "pygame": pygame.version.ver,
+        "numpy": np.__version__,
+        "cpus": os.cpu_count(),
+        "results": results,
+    }
+    text = json.dumps(report, indent=2)
+    if args.out:
+        with open(args.out, "w") as f:
+            f.write(text + "\n")
+    else:
+        print(text)
+
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)["results"]
+        failures = compare(results, baseline, args.max_regression)
+        for line in failures:
+            print("REGRESSION", line, file=sys.stderr)
+        return 1 if failures else 0
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
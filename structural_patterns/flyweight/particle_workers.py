@@ -0,0 +1,160 @@
+"""
+Optional multiprocess mode for flyweight_app.
+
+SharedParticleBuffer is a ParticleBuffer whose columns live in
+multiprocessing.shared_memory blocks. Each frame the particle range is split
+into one shard per worker; workers integrate their shard in place (same
+`integrate` step as the single-process buffer) and the main process only
+renders from the shared arrays.
+
+Scaling curve (update cost only, no rendering):
+    python particle_workers.py --particles 500000 --workers 1,2,4,8
+"""
+import os
+os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+
+import multiprocessing as mp
+import signal
+import time
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+from typing import Dict, List, Tuple
+
+import numpy as np
+
+from flyweight_app import ParticleBuffer, ParticleFlyweightFactory, batch_add, integrate
+
+# =========================
+# Worker side
+# =========================
+# shared-memory block name -> attached block (kept open across frames)
+_attached: Dict[str, shared_memory.SharedMemory] = {}
+
+def _worker_init():
+    # Ctrl+C is the main process's to handle (it closes the pool and unlinks the blocks)
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+
+def _column(block: str, dtype: str, capacity: int) -> np.ndarray:
+    shm = _attached.get(block)
+    if shm is None:
+        shm = shared_memory.SharedMemory(name=block)
+        _attached[block] = shm
+    return np.ndarray(capacity, dtype=dtype, buffer=shm.buf)
+
+def _integrate_shard(layout, lo: int, hi: int, dt: float, seed, world):
+    # release blocks left over from before the buffer last grew
+    live = {block for _, block, _, _ in layout}
+    for block in [b for b in _attached if b not in live]:
+        _attached.pop(block).close()
+    cols = {field: _column(block, dtype, cap)[lo:hi] for field, block, dtype, cap in layout}
+    integrate(cols["x"], cols["y"], cols["vx"], cols["vy"], cols["alpha"], dt,
+              None if seed is None else np.random.default_rng(seed), world)
+
+# =========================
+# Main-process side
+# =========================
+class SharedParticleBuffer(ParticleBuffer):
+    """
+    ParticleBuffer backed by shared memory and integrated by a process pool.
+    Spawning/clearing/drawing stay in the main process; update() blocks until
+    every shard is integrated, so rendering never sees a half-updated frame.
+    If a worker dies (e.g. SIGTERM to the process group) update() raises
+    BrokenProcessPool instead of waiting for its lost shard.
+    Call close() when done (stops the pool and unlinks the blocks).
+    """
+    SIMULATED = ("x", "y", "vx", "vy", "alpha")  # style/alive are only read by the renderer
+
+    def __init__(self, workers: int = 2, capacity: int = 4096, seed: int = None):
+        self.workers = max(1, workers)
+        self._blocks: Dict[str, shared_memory.SharedMemory] = {}
+        self._retired: List[shared_memory.SharedMemory] = []
+        self._pool = ProcessPoolExecutor(self.workers, mp_context=mp.get_context("spawn"),
+                                         initializer=_worker_init)
+        super().__init__(capacity, seed)
+
+    def _new_array(self, name: str, capacity: int, dtype: str):
+        shm = shared_memory.SharedMemory(create=True, size=max(1, capacity * np.dtype(dtype).itemsize))
+        old = self._blocks.get(name)
+        if old is not None:
+            self._retired.append(old)
+        self._blocks[name] = shm
+        return np.ndarray(capacity, dtype=dtype, buffer=shm.buf)
+
+    def _grow(self, min_capacity: int):
+        super()._grow(min_capacity)
+        # the old columns were copied and dropped by _grow, so their blocks can go
+        for shm in self._retired:
+            shm.close()
+            shm.unlink()
+        self._retired.clear()
+
+    def _layout(self) -> Tuple[Tuple[str, str, str, int], ...]:
+        dtypes = dict(self.FIELDS)
+        return tuple((f, self._blocks[f].name, dtypes[f], self.capacity) for f in self.SIMULATED)
+
+    def update(self, dt: float, twinkle: bool = True):
+        n = self.count
+        if n == 0:
+            return
+        bounds = np.linspace(0, n, self.workers + 1).astype(int).tolist()
+        # per-shard seeds come from our Generator, so a seeded run stays reproducible
+        if twinkle:
+            seeds = self.rng.integers(0, 2**63, size=self.workers).tolist()
+        else:
+            seeds = [None] * self.workers
+        layout = self._layout()
+        jobs = [(layout, lo, hi, dt, sd, self.world) for lo, hi, sd in zip(bounds, bounds[1:], seeds) if hi > lo]
+        for _ in self._pool.map(_integrate_shard, *zip(*jobs)):
+            pass
+
+    def close(self):
+        if self._pool is None:
+            return
+        self._pool.shutdown(wait=True, cancel_futures=True)
+        self._pool = None
+        for name, _ in self.FIELDS:
+            setattr(self, name, None)  # drop views before closing the blocks
+        for shm in self._blocks.values():
+            shm.close()
+            shm.unlink()
+        self._blocks.clear()
+
+# =========================
+# Scaling curve
+# =========================
+def scaling_curve(n: int, worker_counts: List[int], frames: int = 60, seed: int = 0):
+    """ms per update() for the single-process buffer and each worker count."""
+    factory = ParticleFlyweightFactory()
+    dt = 1.0 / 60
+    results = []
+    for workers in [0] + list(worker_counts):
+        buf = ParticleBuffer(seed=seed) if workers == 0 else SharedParticleBuffer(workers, seed=seed)
+        try:
+            batch_add(buf, factory, n)
+            buf.update(dt)  # warm-up (workers attach their blocks)
+            t0 = time.perf_counter()
+            for _ in range(frames):
+                buf.update(dt)
+            ms = (time.perf_counter() - t0) * 1000.0 / frames
+        finally:
+            if hasattr(buf, "close"):
+                buf.close()
+        results.append((workers, ms))
+    return results
+
+if __name__ == "__main__":
+    import argparse
+    ap = argparse.ArgumentParser(description="Update-time scaling of SharedParticleBuffer by worker count")
+    ap.add_argument("--particles", type=int, default=500_000)
+    ap.add_argument("--workers", default="1,2,4,8", help="comma-separated worker counts")
+    ap.add_argument("--frames", type=int, default=60)
+    args = ap.parse_args()
+
+    counts = [int(w) for w in args.workers.split(",") if w.strip()]
+    rows = scaling_curve(args.particles, counts, args.frames)
+    base = rows[0][1]
+    print(f"particles={args.particles:,}  frames={args.frames}  cpus={os.cpu_count()}")
+    print(f"{'workers':>8} {'ms/update':>10} {'speedup':>8}")
+    for workers, ms in rows:
+        label = "inline" if workers == 0 else str(workers)
+        print(f"{label:>8} {ms:10.2f} {base / ms:8.2f}x")
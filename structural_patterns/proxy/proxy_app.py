@@ -1,6 +1,17 @@
-import pygame, random, time
+import pygame, random, time, os, sys, math, functools, threading, hashlib, heapq
+from collections import deque
 from abc import ABC, abstractmethod
 
+try:
+    import numpy as np  # optional: vectorized texture generator
+except ImportError:
+    np = None
+
+# structural_patterns/ on the path for the helpers shared by all demos (common/)
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from common.frame_profiler import frame_profiler
+from common.text_cache import render_text
+
 # =========================
 # Config
 # =========================
@@ -15,6 +26,9 @@ CYAN = (90, 220, 220)
 YELLOW = (255, 210, 90)
 BLUE = (80, 140, 255)
 
+TILE_W, TILE_H = 160, 100   # gallery textures streamed through the AssetManager
+TILE_STEP = 200
+
 GRAVITY = 1500.0
 MOVE_SPEED = 320.0
 JUMP_POWER = 560.0
@@ -30,6 +44,132 @@ class Texture(ABC):
     @abstractmethod
     def is_loaded(self) -> bool: ...
 
+# =========================
+# Procedural texture generator (NumPy)
+# =========================
+GENERATOR_VERSION = 2  # bump whenever generate_pixels() output changes: old cache entries stop matching
+STAR_COUNT = 900
+BLOB_COUNT = 60
+BLOB_COLOR = (90, 140, 255)
+
+@functools.lru_cache(maxsize=None)
+def falloff_kernel(rad: int):
+    """(2r, 2r) float32 weights: 1 at the centre, easing to 0 at radius r."""
+    yy, xx = np.mgrid[0:2 * rad, 0:2 * rad]
+    d = np.hypot(xx - rad + 0.5, yy - rad + 0.5) / rad
+    k = np.clip(1.0 - d, 0.0, 1.0)
+    return (k * k).astype(np.float32)
+
+_sprite_lock = threading.Lock()  # blob sprites are shared; set_alpha + blit must not interleave
+
+@functools.lru_cache(maxsize=None)
+def blob_sprite(rad: int) -> pygame.Surface:
+    """BLOB_COLOR with the falloff kernel as per-pixel alpha, built once per radius."""
+    bgra = np.empty((2 * rad, 2 * rad, 4), np.uint8)
+    bgra[..., :3] = BLOB_COLOR[::-1]
+    bgra[..., 3] = falloff_kernel(rad) * 255
+    return pygame.image.frombuffer(bgra.tobytes(), (2 * rad, 2 * rad), "BGRA")
+
+def generate_pixels(w: int, h: int, seed: int = None, progress=None):
+    """
+    Starry gradient as an (h, w, 4) uint8 BGRA array: row-major and in the
+    byte order of pygame's own 32-bit SRCALPHA surfaces, so the Surface that
+    pixels_to_surface() wraps around it blits without any conversion.
+      - gradient: one (h, 4) column broadcast across the width
+      - stars: a single fancy-indexed write
+      - nebula blobs: cached radial falloff sprites, alpha-blended by SDL
+        straight into the array (the Surface shares its memory)
+    progress(fraction), if given, is called as the stages complete; it is
+    safe to call from a worker thread (NumPy and SDL blits do the work).
+    """
+    rng = np.random.default_rng(seed)
+    t = np.arange(h, dtype=np.float32) / max(1, h - 1)
+    column = np.empty((h, 4), np.uint8)
+    column[:, 2] = 30 + 20 * (1 - t)  # R
+    column[:, 1] = 40 + 30 * (1 - t)  # G
+    column[:, 0] = 70 + 80 * t        # B
+    column[:, 3] = 255
+    pix = np.empty((h, w, 4), np.uint8)
+    # one uint32 per pixel: the broadcast copies whole pixels, not single bytes
+    pix.view(np.uint32)[:] = column.view(np.uint32)[:, None, :]
+    if progress: progress(0.4)
+
+    xs = rng.integers(0, w, STAR_COUNT)
+    ys = rng.integers(0, h, STAR_COUNT)
+    pix[ys, xs, :3] = rng.integers(200, 241, STAR_COUNT, dtype=np.uint8)[:, None]
+    pix[ys, xs, 3] = 200
+    if progress: progress(0.5)
+
+    canvas = pixels_to_surface(pix)
+    blobs = zip(rng.integers(0, w + 1, BLOB_COUNT).tolist(), rng.integers(0, h + 1, BLOB_COUNT).tolist(),
+                rng.integers(16, 71, BLOB_COUNT).tolist(), rng.integers(30, 81, BLOB_COUNT).tolist())
+    for i, (rx, ry, rad, alpha) in enumerate(blobs, 1):
+        sprite = blob_sprite(rad)
+        with _sprite_lock:
+            sprite.set_alpha(alpha)  # scales the kernel's per-pixel alpha
+            canvas.blit(sprite, (rx - rad, ry - rad))
+        if progress and i % 10 == 0: progress(0.5 + 0.5 * i / BLOB_COUNT)
+    return pix
+
+def pixels_to_surface(pix) -> pygame.Surface:
+    h, w = pix.shape[:2]
+    return pygame.image.frombuffer(pix, (w, h), "BGRA")  # shares the array, no copy
+
+# =========================
+# On-disk texture cache
+# =========================
+class TextureCache:
+    """
+    Content-addressed store for generated backgrounds:
+      - the key is a hash of (w, h, seed, GENERATOR_VERSION); one .npy per key
+      - hits are memory-mapped copy-on-write, so a warm start maps the file
+        instead of generating (pages are read as the texture is drawn)
+      - misses are written to a temp file and renamed into place, so a crash
+        or a concurrent writer never leaves a half-written entry behind
+    Every lookup is logged as a hit or a miss.
+    """
+    def __init__(self, cache_dir: str):
+        self.dir = cache_dir
+        os.makedirs(cache_dir, exist_ok=True)
+        self.hits = 0
+        self.misses = 0
+
+    def path(self, w: int, h: int, seed: int) -> str:
+        key = hashlib.sha1(f"{w}x{h}:seed={seed}:v{GENERATOR_VERSION}".encode()).hexdigest()[:16]
+        return os.path.join(self.dir, f"bg_{key}.npy")
+
+    def load(self, w: int, h: int, seed: int):
+        path = self.path(w, h, seed)
+        t0 = time.perf_counter()
+        try:
+            pix = np.load(path, mmap_mode="c")
+        except FileNotFoundError:
+            pix = None
+        except (OSError, ValueError) as e:  # truncated / foreign file: regenerate over it
+            print(f"[texture-cache] unreadable {path}: {e}")
+            pix = None
+        if pix is None or pix.shape != (h, w, 4) or pix.dtype != np.uint8:
+            self.misses += 1
+            print(f"[texture-cache] miss {w}x{h} seed={seed} -> {os.path.basename(path)}")
+            return None
+        self.hits += 1
+        print(f"[texture-cache] hit  {w}x{h} seed={seed} <- {os.path.basename(path)} "
+              f"({(time.perf_counter() - t0) * 1000:.2f} ms)")
+        return pix
+
+    def store(self, w: int, h: int, seed: int, pix) -> None:
+        path = self.path(w, h, seed)
+        tmp = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp, "wb") as f:
+            np.save(f, pix)
+        os.replace(tmp, path)
+
+def load_cached_pixels(cache, w: int, h: int, seed: int):
+    """Cached pixels, or None. Only seeded NumPy textures are cacheable."""
+    if cache is None or seed is None or np is None:
+        return None
+    return cache.load(w, h, seed)
+
 # =========================
 # RealSubject: heavy texture
 # =========================
@@ -37,15 +177,39 @@ class RealTexture(Texture):
     """
     Simulates heavy loading in __init__ (blocking) when blocking=True.
     Generates a big starry gradient surface once, then draws it fast.
+    With NumPy the pixels come from generate_pixels(); otherwise the
+    per-row / per-star drawing loop below is used. A TextureCache (and a
+    fixed seed) lets a later run map the pixels from disk instead.
     """
-    def __init__(self, w: int, h: int, blocking: bool = True):
+    def __init__(self, w: int, h: int, blocking: bool = True, seed: int = None, surface: pygame.Surface = None,
+                 cache: "TextureCache" = None):
+        if surface is not None:
+            # already built elsewhere (e.g. by ProxyTexture's loader thread)
+            self.surface = surface
+            self._loaded = True
+            return
+        cached = load_cached_pixels(cache, w, h, seed)
+        if cached is not None:
+            self.surface = pixels_to_surface(cached)
+            self._loaded = True
+            return
         if blocking:
             # Simulate a costly load (decode PNG, generate large surface, etc.)
             time.sleep(1.0)  # <-- causes a visible stutter if used directly
-        self.surface = self._generate_surface(w, h)
+        self.surface = self._generate_surface(w, h, seed, cache)
         self._loaded = True
 
-    def _generate_surface(self, w, h) -> pygame.Surface:
+    def _generate_surface(self, w, h, seed=None, cache=None) -> pygame.Surface:
+        if np is None:
+            return self._generate_surface_loops(w, h, seed)
+        pix = generate_pixels(w, h, seed)
+        if cache is not None and seed is not None:
+            cache.store(w, h, seed, pix)
+        return pixels_to_surface(pix)
+
+    @staticmethod
+    def _generate_surface_loops(w, h, seed=None) -> pygame.Surface:
+        rng = random.Random(seed)
         surf = pygame.Surface((w, h), pygame.SRCALPHA)
         # gradient
         for y in range(h):
@@ -55,17 +219,17 @@ class RealTexture(Texture):
             b = int(70 + 80 * t)
             pygame.draw.line(surf, (r, g, b, 255), (0, y), (w, y))
         # stars / blobs
-        for _ in range(900):
-            x = random.randint(0, w - 1)
-            y = random.randint(0, h - 1)
-            color = (220 + random.randint(-20, 20),) * 3
+        for _ in range(STAR_COUNT):
+            x = rng.randint(0, w - 1)
+            y = rng.randint(0, h - 1)
+            color = (220 + rng.randint(-20, 20),) * 3
             surf.set_at((x, y), (*color[:3], 200))
         # a big soft blob (nebula)
-        for _ in range(60):
-            rx = random.randint(0, w)
-            ry = random.randint(0, h)
-            rad = random.randint(16, 70)
-            alpha = random.randint(30, 80)
+        for _ in range(BLOB_COUNT):
+            rx = rng.randint(0, w)
+            ry = rng.randint(0, h)
+            rad = rng.randint(16, 70)
+            alpha = rng.randint(30, 80)
             blob = pygame.Surface((rad * 2, rad * 2), pygame.SRCALPHA)
             pygame.draw.circle(blob, (90, 140, 255, alpha), (rad, rad), rad)
             surf.blit(blob, (rx - rad, ry - rad), special_flags=pygame.BLEND_PREMULTIPLIED)
@@ -83,61 +247,363 @@ class RealTexture(Texture):
 # =========================
 # Proxy: non-blocking placeholder → then swap to RealTexture
 # =========================
-class ProxyTexture(Texture):
+class LoadCancelled(Exception):
+    """Raised inside a loader thread when its proxy no longer wants the result."""
+
+# =========================
+# Async asset streaming: generic proxies + a prioritized worker pool
+# =========================
+class AssetProxy(Texture):
     """
-    Virtual Proxy:
-      - Starts light and draws a placeholder.
-      - After LOAD_DELAY seconds, it builds the real texture WITHOUT blocking the loop.
-        (We simulate delay with a timer, then instantiate RealTexture(blocking=False)).
+    Virtual Proxy for any heavy asset, issued by an AssetManager:
+      - build(report) runs on a worker thread and returns a payload (pixels,
+        decoded audio, ...), calling report(fraction) as it goes
+      - finalize(payload) runs on the main thread and returns the real
+        subject (anything with draw/is_loaded), which the proxy then delegates to
+      - rect (world space, optional) is what the manager uses for visibility
+        and priority; a proxy without one is always wanted
+    Until the real subject is ready the proxy draws a placeholder.
     """
-    LOAD_DELAY = 1.2
-
-    def __init__(self, w: int, h: int):
+    def __init__(self, w: int, h: int, build, finalize, rect: pygame.Rect = None):
         self.w, self.h = w, h
-        self._real: RealTexture | None = None
-        self._timer = 0.0
-        self._loading_started = False
-        # tiny spinner state
-        self._spin = 0
+        self.build = build
+        self.finalize = finalize
+        self.rect = rect
+        self.active = True     # False: never wanted (e.g. its layer is hidden)
+        self.visible = False   # on screen as of the last AssetManager.update()
+        self.load_ms = 0.0     # main-thread cost of finalize()
+        self.error = None      # last load failure ("Type: message"), cleared on success
+        self.failures = 0
+        self._retry_at = 0.0   # perf_counter() time before which a failed load is not re-issued
+        self._real = None
+        self._job = None
+
+    @property
+    def progress(self) -> float:
+        """0..1; read from the current job, so a cancelled loader can no longer move it."""
+        if self._real is not None:
+            return 1.0
+        job = self._job
+        return job.progress if job is not None else 0.0
 
     def draw(self, surface: pygame.Surface, x: int, y: int) -> None:
-        if self._real and self._real.is_loaded():
+        if self._real is not None:
             self._real.draw(surface, x, y)
-            return
+        else:
+            self.draw_placeholder(surface, x, y)
+
+    def draw_placeholder(self, surface: pygame.Surface, x: int, y: int) -> None:
+        r = pygame.Rect(x, y, self.w, self.h)
+        pygame.draw.rect(surface, (24, 28, 36), r, border_radius=6)
+        pygame.draw.rect(surface, (70, 80, 96), r, width=2, border_radius=6)
+        bar = pygame.Rect(x + 12, y + self.h // 2 - 3, self.w - 24, 6)
+        pygame.draw.rect(surface, (50, 58, 72), bar)
+        if self._job is not None:
+            pygame.draw.rect(surface, (90, 160, 255), (bar.x, bar.y, int(bar.w * self.progress), bar.h))
+        elif self.error is not None:
+            pygame.draw.rect(surface, (200, 70, 70), bar)
+            surface.blit(render_text("load failed", (230, 120, 120)), (bar.x, bar.bottom + 4))
 
-        # draw placeholder card with spinner
-        placeholder = pygame.Surface((self.w, self.h))
-        placeholder.fill((24, 28, 36))
-        pygame.draw.rect(placeholder, (70, 80, 96), placeholder.get_rect(), width=3, border_radius=8)
+    def update(self, dt: float) -> None:
+        pass  # loading is driven by AssetManager.update()
 
-        font = pygame.font.SysFont("consolas", 20)
-        text = font.render("Loading big background (via Proxy)...", True, (210, 210, 210))
-        placeholder.blit(text, (16, 16))
+    def is_loaded(self) -> bool:
+        return self._real is not None and self._real.is_loaded()
 
-        # spinner
-        cx, cy = self.w // 2, self.h // 2
-        for i in range(8):
-            ang = (i + self._spin) * 0.8
-            r = 26 + i * 2
-            px = int(cx + r * 0.9 * pygame.math.Vector2(1, 0).rotate_rad(ang).x)
-            py = int(cy + r * 0.9 * pygame.math.Vector2(1, 0).rotate_rad(ang).y)
-            alpha = 60 + i * 20
-            pygame.draw.circle(placeholder, (90, 160, 255, min(255, alpha)), (px, py), 4)
-        self._spin = (self._spin + 1) % 8
+class _AssetJob:
+    """One build request; a cancelled job is abandoned and a fresh one is issued if needed again."""
+    QUEUED, RUNNING, DONE = "queued", "running", "done"
+
+    def __init__(self, proxy: AssetProxy, seq: int):
+        self.proxy = proxy
+        self.seq = seq
+        self.priority = (0, 0.0)
+        self.state = self.QUEUED
+        self.cancelled = False
+        self.progress = 0.0    # written by the worker thread, read through proxy.progress
+        self.payload = None
+        self.error = None
+
+    def report(self, fraction: float):
+        if self.cancelled:
+            raise LoadCancelled()
+        self.progress = fraction
+
+class AssetManager:
+    """
+    Streams heavy assets in behind AssetProxy placeholders:
+      - a bounded pool of worker threads builds payloads, always taking the
+        most urgent queued request first: on-screen before prefetch, then
+        nearest to the focus point
+      - update(view, focus) re-ranks the queue once per frame and cancels the
+        requests whose proxies left the wanted area (the view grown by
+        `prefetch` px): queued ones are dropped, running ones stop at their
+        next progress report; they are issued again if they come back
+      - finished payloads are finalized on the main thread, at most
+        `max_finalize` per frame, so a burst of completions cannot spike a frame
+      - a failed load is logged and recorded on its proxy (error, failures),
+        then re-issued after `retry_delay` s, doubling on each failure, up to
+        `max_retries` times; update() itself never raises it
+    """
+    def __init__(self, workers: int = 2, max_finalize: int = 2, prefetch: int = 200,
+                 retry_delay: float = 1.0, max_retries: int = 3):
+        self.max_finalize = max_finalize
+        self.prefetch = prefetch
+        self.retry_delay = retry_delay
+        self.max_retries = max_retries
+        self.proxies: list[AssetProxy] = []
+        self.finalized = 0
+        self.cancelled = 0
+        self._seq = 0
+        self._heap = []            # (priority, seq, job), rebuilt by update()
+        self._done = deque()       # jobs with a payload, waiting for finalize
+        self._running = 0
+        self._closed = False
+        self._cv = threading.Condition()
+        self._threads = [threading.Thread(target=self._worker, name=f"asset-worker-{i}", daemon=True)
+                         for i in range(workers)]
+        for t in self._threads:
+            t.start()
+
+    def add(self, proxy: AssetProxy) -> AssetProxy:
+        self.proxies.append(proxy)
+        return proxy
+
+    def _worker(self):
+        while True:
+            with self._cv:
+                while not self._heap and not self._closed:
+                    self._cv.wait()
+                if self._closed:
+                    return
+                job = heapq.heappop(self._heap)[2]
+                job.state = job.RUNNING
+                self._running += 1
+            try:
+                job.payload = job.proxy.build(job.report)
+            except LoadCancelled:
+                pass
+            except Exception as e:  # recorded on the proxy by update(), on the main thread
+                job.error = e
+            with self._cv:
+                self._running -= 1
+                if not job.cancelled:
+                    job.state = job.DONE
+                    self._done.append(job)
+
+    def update(self, view: pygame.Rect = None, focus=None) -> None:
+        """Once per frame, on the main thread: re-rank, cancel, then finalize a few results."""
+        area = view.inflate(2 * self.prefetch, 2 * self.prefetch) if view is not None else None
+        fx, fy = focus if focus is not None else (view.center if view is not None else (0, 0))
+        now = time.perf_counter()
+        with self._cv:
+            queued = []
+            for p in self.proxies:
+                if p.rect is None or area is None:
+                    on_screen = wanted = p.active
+                    dist = 0.0
+                else:
+                    on_screen = p.active and p.rect.colliderect(view)
+                    wanted = p.active and p.rect.colliderect(area)
+                    dist = math.hypot(p.rect.centerx - fx, p.rect.centery - fy)
+                p.visible = on_screen
+                if p._real is not None:
+                    continue
+                job = p._job
+                if not wanted:
+                    if job is not None and job.state != job.DONE:
+                        job.cancelled = True
+                        p._job = None
+                        self.cancelled += 1
+                    continue
+                if job is None:
+                    if p.error is not None and (p.failures > self.max_retries or now < p._retry_at):
+                        continue  # failed: waiting for its retry, or given up
+                    self._seq += 1
+                    job = p._job = _AssetJob(p, self._seq)
+                if job.state == job.QUEUED:
+                    job.priority = (0 if on_screen else 1, dist)
+                    queued.append((job.priority, job.seq, job))
+            heapq.heapify(queued)
+            self._heap = queued
+            if queued:
+                self._cv.notify(len(queued))
+
+        for _ in range(self.max_finalize):
+            if not self._done:
+                break
+            job = self._done.popleft()
+            p = job.proxy
+            p._job = None
+            if job.error is None:
+                t0 = time.perf_counter()
+                try:
+                    p._real = p.finalize(job.payload)
+                except Exception as e:
+                    job.error = e
+                p.load_ms = (time.perf_counter() - t0) * 1000
+            if job.error is not None:
+                self._failed(p, job.error)
+                continue
+            p.error = None
+            self.finalized += 1
+
+    def _failed(self, p: AssetProxy, error: Exception) -> None:
+        p.error = f"{type(error).__name__}: {error}"
+        p.failures += 1
+        if p.failures > self.max_retries:
+            print(f"[assets] load failed ({p.failures}x), giving up: {p.error}")
+        else:
+            delay = self.retry_delay * 2 ** (p.failures - 1)
+            p._retry_at = time.perf_counter() + delay
+            print(f"[assets] load failed ({p.failures}x), retrying in {delay:.1f}s: {p.error}")
+
+    def stats(self) -> dict:
+        with self._cv:
+            return {"ready": sum(1 for p in self.proxies if p._real is not None),
+                    "total": len(self.proxies), "queued": len(self._heap), "running": self._running,
+                    "pending_finalize": len(self._done), "cancelled": self.cancelled,
+                    "failed": sum(1 for p in self.proxies if p._real is None and p.error is not None)}
+
+    def close(self):
+        """Cancel everything and let the workers exit (running builds stop at their next report)."""
+        with self._cv:
+            self._closed = True
+            for p in self.proxies:
+                if p._job is not None:
+                    p._job.cancelled = True
+            self._heap = []
+            self._cv.notify_all()
+
+def texture_asset(manager: AssetManager, w: int, h: int, seed: int, rect: pygame.Rect = None,
+                  io_delay: float = 0.3) -> AssetProxy:
+    """A generated texture streamed through `manager` (simulated read, then generate_pixels)."""
+    def build(report):
+        for i in range(4):
+            time.sleep(io_delay / 4)
+            report(0.5 * (i + 1) / 4)
+        if np is None:
+            return RealTexture._generate_surface_loops(w, h, seed)
+        return generate_pixels(w, h, seed, lambda f: report(0.5 + 0.5 * f))
+
+    def finalize(payload):
+        return RealTexture(w, h, surface=pixels_to_surface(payload) if np is not None else payload)
+
+    return manager.add(AssetProxy(w, h, build, finalize, rect))
+
+class ProxyTexture(AssetProxy):
+    """
+    Virtual Proxy for the big background, now an AssetProxy:
+      - Starts light and draws a placeholder card.
+      - Its build (the simulated LOAD_DELAY read and the pixel generation)
+        runs on an AssetManager worker, reporting progress (0..1) as it goes.
+      - Once the pixels are ready, only the cheap part (wrapping them in a
+        Surface, no copy) runs on the main thread, and the proxy starts
+        delegating to the RealTexture.
+    Without a shared manager it gets a private one-worker manager and
+    update() drives it, so it still works as a standalone proxy.
+    """
+    LOAD_DELAY = 1.2     # simulated disk read / decode, spent on the loader thread
+    IO_STEPS = 12
+    SPIN_FRAMES = 8
+    CARD_COLOR = (24, 28, 36)
+
+    def __init__(self, w: int, h: int, seed: int = None, cache: TextureCache = None,
+                 manager: AssetManager = None):
+        super().__init__(w, h, self._load, self._finalize)
+        self.seed = seed
+        self.cache = cache
+        self._own_manager = manager is None
+        self.manager = (AssetManager(workers=1) if manager is None else manager)
+        self.manager.add(self)
+        # tiny spinner state
+        self._spin = 0
+        self._placeholder: pygame.Surface | None = None  # built on first draw
+
+    def _load(self, report):
+        """Loader thread: cache hit, or simulated I/O then pixels (NumPy) / a ready Surface (fallback)."""
+        cached = load_cached_pixels(self.cache, self.w, self.h, self.seed)
+        if cached is not None:
+            return cached
+        for i in range(self.IO_STEPS):
+            time.sleep(self.LOAD_DELAY / self.IO_STEPS)
+            report(0.5 * (i + 1) / self.IO_STEPS)
+        if np is None:
+            return RealTexture._generate_surface_loops(self.w, self.h, self.seed)
+        pix = generate_pixels(self.w, self.h, self.seed, lambda f: report(0.5 + 0.5 * f))
+        if self.cache is not None and self.seed is not None:
+            self.cache.store(self.w, self.h, self.seed, pix)
+        return pix
+
+    def _finalize(self, payload) -> RealTexture:
+        surf = pixels_to_surface(payload) if np is not None else payload
+        return RealTexture(self.w, self.h, surface=surf)
+
+    def draw_placeholder(self, surface: pygame.Surface, x: int, y: int) -> None:
+        if self._placeholder is None:
+            self._build_placeholder()
+        ph = self._placeholder
+        # dirty region 1: the spinner, one prebuilt opaque frame
+        ph.blit(self._spin_frames[self._spin], self._spin_rect)
+        self._spin = (self._spin + 1) % self.SPIN_FRAMES
+        # dirty region 2: the progress bar, only when it visibly changes
+        bar = self._bar
+        fill, pct = int(bar.w * self.progress), int(self.progress * 100)
+        failed = self._job is None and self.error is not None
+        if (fill, pct, failed) != self._shown_progress:
+            ph.blit(self._bar_bg, self._bar_area)
+            pygame.draw.rect(ph, (50, 58, 72), bar, border_radius=5)
+            pygame.draw.rect(ph, (90, 160, 255), (bar.x, bar.y, fill, bar.h), border_radius=5)
+            if failed:
+                text = render_text(f"Load failed: {self.error}"[:60], (230, 120, 120))
+            else:
+                text = render_text(f"{pct}%", (210, 210, 210))
+            ph.blit(text, (bar.centerx - text.get_width() // 2, bar.bottom + 6))
+            self._shown_progress = (fill, pct, failed)
+
+        surface.blit(ph, (x, y))
 
-        surface.blit(placeholder, (x, y))
+    def _build_placeholder(self):
+        """Card + title once, plus every spinner frame; draw() then only patches dirty regions."""
+        card = pygame.Surface((self.w, self.h))
+        if pygame.display.get_surface() is not None:
+            card = card.convert()
+        card.fill(self.CARD_COLOR)
+        pygame.draw.rect(card, (70, 80, 96), card.get_rect(), width=3, border_radius=8)
+        card.blit(render_text("Loading big background (via Proxy)...", (210, 210, 210), ("consolas", 20)), (16, 16))
+
+        cx, cy = self.w // 2, self.h // 2
+        self._spin_rect = pygame.Rect(cx - 42, cy - 42, 84, 84)  # outermost dot: 36 px out, 4 px radius
+        self._spin_frames = []
+        for spin in range(self.SPIN_FRAMES):
+            frame = card.subsurface(self._spin_rect).copy()
+            for i in range(8):
+                ang = (i + spin) * 0.8
+                r = (26 + i * 2) * 0.9
+                px = int(cx + r * math.cos(ang)) - self._spin_rect.x
+                py = int(cy + r * math.sin(ang)) - self._spin_rect.y
+                alpha = 60 + i * 20
+                pygame.draw.circle(frame, (90, 160, 255, min(255, alpha)), (px, py), 4)
+            self._spin_frames.append(frame)
+
+        # progress bar (the loader thread updates self.progress)
+        self._bar = pygame.Rect(cx - 120, cy + 60, 240, 10)
+        label_h = render_text("100%", (210, 210, 210)).get_height()
+        self._bar_area = pygame.Rect(16, self._bar.y, self.w - 32, self._bar.h + 6 + label_h)
+        self._bar_bg = card.subsurface(self._bar_area).copy()
+        self._shown_progress = None
+        self._placeholder = card
 
     def update(self, dt: float) -> None:
-        if self._real and self._real.is_loaded():
-            return
-        self._timer += dt
-        if self._timer >= self.LOAD_DELAY and not self._loading_started:
-            # Instantiate the real texture WITHOUT blocking (skip sleep).
-            self._real = RealTexture(self.w, self.h, blocking=False)
-            self._loading_started = True
+        if self._own_manager:
+            self.manager.update()
 
-    def is_loaded(self) -> bool:
-        return self._real is not None and self._real.is_loaded()
+    def close(self):
+        """Abandon an in-flight load (the loader stops at its next progress report)."""
+        if self._own_manager:
+            self.manager.close()
+        elif self._job is not None:
+            self._job.cancelled = True
 
 # =========================
 # Simple player to make it feel like a game
@@ -186,23 +652,25 @@ def draw_ground(surf):
     pygame.draw.rect(surf, GROUND, (0, GROUND_Y, WIDTH, HEIGHT - GROUND_Y))
     pygame.draw.line(surf, (70, 80, 94), (0, GROUND_Y), (WIDTH, GROUND_Y), 2)
 
-def draw_hud(surf, using_proxy: bool, bg_visible: bool, bg_loaded: bool):
-    font = pygame.font.SysFont("consolas", 18)
+def draw_hud(surf, using_proxy: bool, bg_visible: bool, bg_loaded: bool, assets: dict = None):
     lines = [
         "Proxy Pattern demo — Virtual Proxy for a heavy background texture",
         f"Mode: {'Proxy (non-blocking)' if using_proxy else 'Direct Real (blocking on creation)'}",
         f"Background visible: {'YES' if bg_visible else 'NO'}   Loaded: {'YES' if bg_loaded else 'NO'}",
-        "Controls: A/D move, SPACE jump | P toggle proxy | V toggle background | ESC quit",
+        "Controls: A/D move, SPACE jump | P toggle proxy | V toggle background | G toggle gallery | ESC quit",
     ]
+    if assets is not None:
+        lines.append(f"Assets: {assets['ready']}/{assets['total']} ready  queued {assets['queued']}  "
+                     f"running {assets['running']}  cancelled {assets['cancelled']}  failed {assets['failed']}")
     y = 10
     for i, t in enumerate(lines):
         c = WHITE if i == 0 else (210, 210, 210)
-        surf.blit(font.render(t, True, c), (10, y)); y += 20
+        surf.blit(render_text(t, c), (10, y)); y += 20
 
 # =========================
 # Main
 # =========================
-def main():
+def main(seed: int = 1, texture_cache: str = None, gallery_size: int = 24, workers: int = 2):
     pygame.init()
     screen = pygame.display.set_mode((WIDTH, HEIGHT))
     pygame.display.set_caption("Proxy Pattern with pygame — Virtual Proxy for heavy texture")
@@ -212,13 +680,25 @@ def main():
 
     # Two ways to access the big background: direct RealTexture vs ProxyTexture
     real_bg = None
-    proxy_bg = ProxyTexture(WIDTH, GROUND_Y)
+    cache = TextureCache(texture_cache) if texture_cache and np is not None else None
+    assets = AssetManager(workers=workers, max_finalize=1)
+    proxy_bg = ProxyTexture(WIDTH, GROUND_Y, seed=seed, cache=cache, manager=assets)
     using_proxy = True
     bg_visible = True
 
+    # Gallery: many small textures streamed through the same manager; it scrolls
+    # with the player, and only the tiles near the view are ever built
+    gallery = [texture_asset(assets, TILE_W, TILE_H, seed + 100 + i,
+                             pygame.Rect(40 + i * TILE_STEP, 120, TILE_W, TILE_H))
+               for i in range(gallery_size)]
+    gallery_w = 40 + gallery_size * TILE_STEP
+    show_gallery = True
+
+    prof = frame_profiler("proxy")  # opt-in: FRAME_PROFILE=1
     running = True
     while running:
         dt = clock.tick(FPS) / 1000.0
+        prof.begin_frame()
 
         for e in pygame.event.get():
             if e.type == pygame.QUIT: running = False
@@ -228,19 +708,26 @@ def main():
                     using_proxy = not using_proxy
                 elif e.key == pygame.K_v:
                     bg_visible = not bg_visible
+                elif e.key == pygame.K_g:
+                    show_gallery = not show_gallery
+                    for tile in gallery: tile.active = show_gallery
                 elif e.key == pygame.K_r and not using_proxy:
                     # (Optional) force re-create the real bg for testing hitch
                     real_bg = None
 
         keys = pygame.key.get_pressed()
+        prof.mark("event")
         player.update(dt, keys)
 
-        # Update proxy (non-blocking)
-        proxy_bg.update(dt)
+        # Update proxies (non-blocking): re-rank, cancel off-view requests, finalize a few
+        scroll = int(player.x / (WIDTH - player.w) * max(0, gallery_w - WIDTH))
+        view = pygame.Rect(scroll, 0, WIDTH, HEIGHT)
+        assets.update(view, (scroll + player.rect().centerx, 170))
 
         # If using direct RealTexture and needed, create it ON DEMAND (this blocks ~1s)
         if not using_proxy and bg_visible and real_bg is None:
-            real_bg = RealTexture(WIDTH, GROUND_Y, blocking=True)
+            real_bg = RealTexture(WIDTH, GROUND_Y, blocking=True, seed=seed, cache=cache)
+        prof.mark("update")
 
         # Render
         screen.fill(BG)
@@ -257,13 +744,30 @@ def main():
         else:
             bg_loaded = False
 
+        for tile in gallery:
+            if tile.visible:
+                tile.draw(screen, tile.rect.x - scroll, tile.rect.y)
+
         draw_ground(screen)
         player.draw(screen)
-        draw_hud(screen, using_proxy, bg_visible, bg_loaded)
+        draw_hud(screen, using_proxy, bg_visible, bg_loaded, assets.stats())
+        prof.draw(screen)
+        prof.mark("render")
 
         pygame.display.flip()
+        prof.mark("flip")
 
+    prof.close()
+    assets.close()
     pygame.quit()
 
 if __name__ == "__main__":
-    main()
+    import argparse
+    ap = argparse.ArgumentParser(description="Proxy pattern demo")
+    ap.add_argument("--seed", type=int, default=1, help="background generator seed")
+    ap.add_argument("--texture-cache", metavar="DIR",
+                    help="keep generated backgrounds as .npy files in DIR and memory-map them on later runs")
+    ap.add_argument("--gallery", type=int, default=24, metavar="N", help="streamed gallery textures")
+    ap.add_argument("--workers", type=int, default=2, help="asset loader threads")
+    args = ap.parse_args()
+    main(args.seed, args.texture_cache, args.gallery, args.workers)
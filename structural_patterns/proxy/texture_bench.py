@@ -0,0 +1,54 @@
+"""
+Background generation benchmark for the Proxy demo.
+
+Times RealTexture's per-row / per-star drawing loop against the NumPy
+generator (generate_pixels + frombuffer) at a few resolutions, headless.
+
+    python texture_bench.py
+    python texture_bench.py --sizes 1920x1080,3840x2160 --repeat 10
+"""
+import os
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+
+import argparse
+import statistics
+import sys
+import time
+
+import pygame
+
+import proxy_app as app
+
+def _time_ms(fn, repeat: int) -> float:
+    fn()  # warm-up: builds the cached blob sprites
+    samples = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - t0) * 1000)
+    return statistics.median(samples)
+
+def main(argv=None) -> int:
+    ap = argparse.ArgumentParser(description="RealTexture generation: drawing loop vs NumPy")
+    ap.add_argument("--sizes", default="1000x480,1920x1080,3840x2160", help="comma-separated WxH list")
+    ap.add_argument("--repeat", type=int, default=5)
+    ap.add_argument("--seed", type=int, default=1)
+    args = ap.parse_args(argv)
+    if app.np is None:
+        ap.error("NumPy is required for the vectorized generator")
+
+    pygame.init()
+    try:
+        print(f"{'size':>10} {'loops ms':>9} {'numpy ms':>9} {'speedup':>8}")
+        for size in args.sizes.split(","):
+            w, h = (int(v) for v in size.lower().split("x"))
+            loops = _time_ms(lambda: app.RealTexture._generate_surface_loops(w, h, args.seed), args.repeat)
+            vec = _time_ms(lambda: app.pixels_to_surface(app.generate_pixels(w, h, args.seed)), args.repeat)
+            print(f"{size:>10} {loops:9.1f} {vec:9.1f} {loops / vec:7.1f}x")
+    finally:
+        pygame.quit()
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -3,12 +3,19 @@ import os
 os.environ["PYGAME_HIDE_SUPPORT_PROMPT"] = "1"
 os.environ["SDL_AUDIODRIVER"] = "dummy"
 
-import math, random
+import math, random, sys
 from typing import List, Tuple, Optional, Dict
 import pygame
 from abc import ABC, abstractmethod
 
+# structural_patterns/ on the path for the helpers shared by all demos (common/)
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from common.fixed_step import FixedStepLoop, add_loop_args
+from common.frame_profiler import frame_profiler
+from common.text_cache import render_text
+
 Vec2 = pygame.math.Vector2
+STEP_HZ = 60  # fixed simulation rate; Player.friction is tuned per step at this rate
 
 # ---------------- Adapter ----------------
 class InputAdapter:
@@ -114,10 +121,12 @@ def clamp_vec(v: Vec2, max_len: float) -> Vec2:
 class Player(Renderable):
     def __init__(self, pos, radius=14, color=(120,210,255)):
         super().__init__(); self.pos=Vec2(pos); self.vel=Vec2(0,0)
+        self.prev_pos=Vec2(pos); self.render_pos=Vec2(pos)  # fixed-step interpolation
         self.radius=radius; self.color=color
         self.max_speed=220.0; self.accel=900.0; self.friction=0.85
         self.bounds = pygame.Rect(0,0,1,1)
     def update_controls(self, inp: InputAdapter, dt: float):
+        self.prev_pos.update(self.pos)
         acc = Vec2(0,0)
         if inp.left: acc.x -= 1
         if inp.right: acc.x += 1
@@ -130,14 +139,17 @@ class Player(Renderable):
         self.pos.x = max(self.radius, min(self.bounds.width - self.radius, self.pos.x))
         self.pos.y = max(self.radius, min(self.bounds.height - self.radius, self.pos.y))
     def draw(self, surf, renderer):
-        renderer.circle(surf, (int(self.pos.x), int(self.pos.y)), self.radius, self.color)
-        renderer.circle(surf, (int(self.pos.x)+4, int(self.pos.y)-4), 3, (255,255,255))
+        p = self.render_pos
+        renderer.circle(surf, (int(p.x), int(p.y)), self.radius, self.color)
+        renderer.circle(surf, (int(p.x)+4, int(p.y)-4), 3, (255,255,255))
+    def interpolate(self, alpha: float): self.render_pos = self.prev_pos.lerp(self.pos, alpha)
     def get_rect(self): return pygame.Rect(int(self.pos.x-self.radius), int(self.pos.y-self.radius), self.radius*2, self.radius*2)
     def update(self, dt): pass
 
 class Hunter(Renderable):
     def __init__(self, pos, color=(255,110,90)):
         super().__init__(); self.pos=Vec2(pos); self.vel=Vec2(0,0)
+        self.prev_pos=Vec2(pos); self.render_pos=Vec2(pos)  # fixed-step interpolation
         self.color=color; self.size=18
         self.max_speed=180.0; self.max_force=280.0; self.lookahead_time=0.6
         self.bounds = pygame.Rect(0,0,1,1)
@@ -153,6 +165,7 @@ class Hunter(Renderable):
             steer = steer.normalize()*self.max_force
         return steer
     def update_ai(self, player: Player, dt: float):
+        self.prev_pos.update(self.pos)
         force = self.pursue(player.pos, player.vel)
         self.vel += force * dt / max(1.0, self.max_force) * self.max_speed
         self.vel = clamp_vec(self.vel, self.max_speed)
@@ -162,11 +175,13 @@ class Hunter(Renderable):
     def draw(self, surf, renderer):
         forward = self.vel.normalize() if self.vel.length_squared()>1 else Vec2(1,0)
         left = Vec2(-forward.y, forward.x)
-        p1 = self.pos + forward * self.size
-        p2 = self.pos - forward * (self.size*0.7) + left * (self.size*0.6)
-        p3 = self.pos - forward * (self.size*0.7) - left * (self.size*0.6)
+        pos = self.render_pos
+        p1 = pos + forward * self.size
+        p2 = pos - forward * (self.size*0.7) + left * (self.size*0.6)
+        p3 = pos - forward * (self.size*0.7) - left * (self.size*0.6)
         pts = [(int(p1.x),int(p1.y)), (int(p2.x),int(p2.y)), (int(p3.x),int(p3.y))]
         renderer.polygon(surf, pts, self.color)
+    def interpolate(self, alpha: float): self.render_pos = self.prev_pos.lerp(self.pos, alpha)
     def get_rect(self): s=self.size; return pygame.Rect(int(self.pos.x-s), int(self.pos.y-s), s*2, s*2)
     def update(self, dt): pass
 
@@ -178,6 +193,7 @@ class LazyHunterProxy(Renderable):
     def __init__(self, spawn_pos: Tuple[int,int], activation_dist=520, drift_speed=60):
         super().__init__()
         self.pos = Vec2(spawn_pos)
+        self.prev_pos = Vec2(spawn_pos); self.render_pos = Vec2(spawn_pos)  # fixed-step interpolation
         self.activation_dist2 = activation_dist*activation_dist
         self.drift_speed = drift_speed
         self._real: Optional[Hunter] = None
@@ -187,6 +203,7 @@ class LazyHunterProxy(Renderable):
             self._real = Hunter(tuple(self.pos))
             print("[LazyHunterProxy] Hunter realized at", (int(self.pos.x), int(self.pos.y)))
     def update_ai(self, player: Player, dt: float, screen_rect: pygame.Rect):
+        self.prev_pos.update(self.pos)
         # light drift toward player even as a placeholder
         if self._real is None:
             dirv = (player.pos - self.pos)
@@ -204,7 +221,10 @@ class LazyHunterProxy(Renderable):
             self._real.update_ai(player, dt)
     def draw(self, surf, renderer):
         if self._real: self._real.draw(surf, renderer)
-        else:          renderer.circle(surf, (int(self.pos.x), int(self.pos.y)), 6, self._placeholder_color)
+        else:          renderer.circle(surf, (int(self.render_pos.x), int(self.render_pos.y)), 6, self._placeholder_color)
+    def interpolate(self, alpha: float):
+        if self._real: self._real.interpolate(alpha)
+        else:          self.render_pos = self.prev_pos.lerp(self.pos, alpha)
     def get_rect(self):
         if self._real: return self._real.get_rect()
         return pygame.Rect(int(self.pos.x-6), int(self.pos.y-6), 12, 12)
@@ -212,12 +232,15 @@ class LazyHunterProxy(Renderable):
 
 # ---------------- Facade ----------------
 class GameApp:
-    def __init__(self, width=960, height=540):
+    def __init__(self, width=960, height=540, headless_steps: int = None, steps_per_frame: int = 1, seed: int = None):
+        if seed is not None: random.seed(seed)
         pygame.init()
         self.screen = pygame.display.set_mode((width, height))
         pygame.display.set_caption("Pursuit (fixed) — See the hunters!")
-        self.clock = pygame.time.Clock()
-        self.font = pygame.font.SysFont(None, 22)
+        self.loop = FixedStepLoop(STEP_HZ, 60, headless=headless_steps is not None,
+                                  steps_per_frame=steps_per_frame, max_steps=headless_steps)
+        self.font = (None, 22)  # default font, resolved once by the shared text cache
+        self.prof = frame_profiler("pursuit")  # opt-in: FRAME_PROFILE=1
 
         self.input = InputAdapter()
         self.filled, self.wire = FilledRenderer(), WireRenderer()
@@ -291,6 +314,9 @@ class GameApp:
             pygame.draw.circle(self.screen, (255,120,100), (hx,hy), 2)
 
     def draw(self):
+        alpha = self.loop.alpha
+        self.player.interpolate(alpha)
+        for h in self.hunters: h.interpolate(alpha)
         self.screen.fill((15,18,26))
         self.scene.draw(self.screen, self.renderer)
         self.draw_radar()
@@ -302,19 +328,30 @@ class GameApp:
         ]
         y = 96
         for s in lines:
-            text = self.font.render(s, True, (235,235,235))
+            text = render_text(s, (235,235,235), self.font)
             self.screen.blit(text, (8, y)); y += 20
-        pygame.display.flip()
 
     def run(self):
         while self.running:
-            dt = self.clock.tick(60) / 1000.0
+            steps = self.loop.advance()
+            self.prof.begin_frame()
             for e in pygame.event.get():
                 if e.type == pygame.QUIT: self.running = False
-            self.update(dt); self.draw()
+            self.prof.mark("event")
+            for _ in range(steps):
+                if not self.running: break
+                self.update(self.loop.dt)
+            self.prof.mark("update")
+            self.draw(); self.prof.draw(self.screen); self.prof.mark("render")
+            pygame.display.flip(); self.prof.mark("flip")
+            if self.loop.done: self.running = False
+        self.prof.close()
+        if self.loop.headless:
+            print(f"[pursuit] {self.loop.report()}  score {self.score:0.2f}s")
+            pygame.quit(); return
         # Game over splash
         self.screen.fill((12,12,12))
-        msg = self.font.render(f"Game Over — survived {self.score:0.1f}s (press any key)", True, (240,240,240))
+        msg = render_text(f"Game Over — survived {self.score:0.1f}s (press any key)", (240,240,240), self.font)
         self.screen.blit(msg, msg.get_rect(center=self.screen.get_rect().center))
         pygame.display.flip()
         waiting = True
@@ -324,4 +361,10 @@ class GameApp:
         pygame.quit()
 
 if __name__ == "__main__":
-    GameApp().run()
+    import argparse
+    ap = add_loop_args(argparse.ArgumentParser(description="Pursuit chase (structural patterns)"))
+    ap.add_argument("--seed", type=int, default=None, help="seed the hunter spawns (reproducible headless runs)")
+    args = ap.parse_args()
+    if args.headless:
+        os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    GameApp(headless_steps=args.headless, steps_per_frame=args.steps_per_frame, seed=args.seed).run()